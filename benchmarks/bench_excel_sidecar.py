@@ -0,0 +1,82 @@
+"""Compare single-cell tracker lookups: pd.read_excel on every call, the columnar sidecar and the streaming reader."""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tracker_sidecar  # noqa: E402
+import tracker_stream  # noqa: E402
+from synthetic_tracker import make_tracker  # noqa: E402
+
+
+def xlsx_lookup(file_path, date, name, sheet_name='Daily'):
+    """The original get_excel_entry body: parse the whole sheet, mask the Days column."""
+    df = pd.read_excel(file_path, sheet_name=sheet_name)
+    df['Days'] = pd.to_datetime(df['Days'], errors='coerce')
+    row = df[df['Days'].dt.date == date]
+    return row[name].values[0]
+
+
+def timed(fn, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), max(samples)
+
+
+def peak_kb(fn):
+    """Peak Python heap of one call, in KB (numpy buffers included, C library allocations not)."""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def report(label, fn, runs):
+    med, worst = timed(fn, runs)
+    print(f"{label:<22} median {med:9.2f} ms   max {worst:9.2f} ms   peak {peak_kb(fn):9.0f} KB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--years', type=int, default=3)
+    parser.add_argument('--people', type=int, default=20)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'tracker.xlsx')
+        days, people = make_tracker(path, years=args.years, people=args.people)
+        rng = random.Random(1)
+        print(f"workbook: {len(days)} rows x {len(people)} people, {os.path.getsize(path) / 1e6:.1f} MB")
+
+        start = time.perf_counter()
+        tracker_sidecar.build_sidecar(path)
+        print(f"sidecar build: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+        def pick():
+            return rng.choice(days), rng.choice(people)
+
+        report('xlsx lookup:', lambda: xlsx_lookup(path, *pick()), args.runs)
+        report('sidecar lookup:', lambda: tracker_sidecar.lookup(path, 'Daily', *pick()), args.runs * 20)
+        report('stream lookup:', lambda: tracker_stream.lookup(path, 'Daily', *pick()), args.runs * 4)
+        # The streaming reader stops at the date, so its cost depends on where the row is
+        for label, at in (('first', 0), ('middle', len(days) // 2), ('last', len(days) - 1)):
+            report(f'stream, {label} day:', lambda: tracker_stream.lookup(path, 'Daily', days[at], rng.choice(people)),
+                   args.runs * 4)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Check the cold import time of the entry points against a budget, with python -X importtime.
+
+Each module is imported in a fresh interpreter a few times and the fastest run is kept. It
+fails (exit 1) when a module goes over its budget or imports pandas, numpy or openpyxl at
+load time: those belong to the Excel paths, which import them on first use.
+
+  python benchmarks/import_budget.py
+  python benchmarks/import_budget.py --runs 5 --scale 2   # slower machine
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Milliseconds of cumulative import time, with headroom over what a laptop measures
+IMPORT_BUDGETS = {
+    'flask_app': 400,
+    'jira_batch': 250,
+    'jiraLogger': 250,
+    'get_pedro_serrano_entry': 50,
+    'tracker_stream': 50,
+}
+HEAVY_MODULES = ('pandas', 'numpy', 'openpyxl')
+
+
+def import_profile(module):
+    """Import `module` in a fresh interpreter; return (cumulative ms, names of every module imported)."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f'import {module} failed:\n{result.stderr[-2000:]}')
+    total, imported = None, set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line.split('|')
+        if not cumulative.strip().isdigit():
+            continue  # the column header
+        imported.add(name.strip())
+        if name.strip() == module:
+            total = int(cumulative) / 1000
+    return total, imported
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--scale', type=float, default=1.0, help='multiply every budget, for slow machines')
+    parser.add_argument('modules', nargs='*', default=list(IMPORT_BUDGETS))
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'module':<26}{'import ms':>10}{'budget ms':>11}  heavy modules")
+    for module in args.modules:
+        best, imported = None, set()
+        for _ in range(max(1, args.runs)):
+            total, imported = import_profile(module)
+            best = total if best is None else min(best, total)
+        budget = IMPORT_BUDGETS.get(module, 0) * args.scale
+        heavy = sorted(m for m in HEAVY_MODULES if m in imported)
+        over = budget and best > budget
+        # Modules without a budget are only reported
+        failed = failed or (module in IMPORT_BUDGETS and (over or bool(heavy)))
+        print(f"{module:<26}{best:>10.1f}{budget:>11.0f}  {', '.join(heavy) or '-'}{'  OVER BUDGET' if over else ''}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
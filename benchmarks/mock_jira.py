@@ -0,0 +1,156 @@
+"""Local stand-in for the JIRA REST endpoints the app uses, with configurable latency and issue count."""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+VERBS = ['Authoring', 'Review']
+TYPES = ['TC', 'TP', 'TC/TP', '']
+USER = {'key': 'bench', 'name': 'bench', 'displayName': 'Benchmark User'}
+
+
+def _seconds(time_spent):
+    match = re.fullmatch(r'(?:(\d+)h)?\s*(?:(\d+)m)?', (time_spent or '').strip())
+    return int(match.group(1) or 0) * 3600 + int(match.group(2) or 0) * 60 if match else 0
+
+
+def make_issues(count, bases=200, seed=0):
+    """Synthetic assigned issues whose summaries look like the tracker's task lines expect."""
+    rng = random.Random(seed)
+    return [{'id': str(10000 + i), 'key': f'BENCH-{i}',
+             'fields': {'summary': f"{rng.choice(VERBS)} {rng.choice(TYPES)} module_{rng.randrange(bases)}".replace('  ', ' '),
+                        'updated': '2024-01-01T00:00:00.000+0000'}}
+            for i in range(count)]
+
+
+class MockJira(ThreadingHTTPServer):
+    """
+    Threaded HTTP server answering /rest/api/2/search, /myself, the worklog updated/deleted/list
+    feeds and POST /rest/api/2/issue/<key>/worklog.
+    With `rate_limit` set, calls beyond that many per second get a 429 with Retry-After, like JIRA's limiter.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, issues=500, latency=0.05, max_results=50, port=0, rate_limit=0):
+        super().__init__(('127.0.0.1', port), _Handler)
+        self.issues = make_issues(issues)
+        self.issue_ids = {issue['key']: issue['id'] for issue in self.issues}
+        self.latency = latency
+        self.max_results = max_results
+        self.rate_limit = rate_limit
+        self.worklogs = []
+        self.throttled = 0
+        self.lock = threading.Lock()
+        self._window = (0, 0)  # (second, calls in it)
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server_port}'
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def over_limit(self):
+        if not self.rate_limit:
+            return False
+        second = int(time.monotonic())
+        with self.lock:
+            calls = self._window[1] + 1 if self._window[0] == second else 1
+            self._window = (second, calls)
+            if calls > self.rate_limit:
+                self.throttled += 1
+                return True
+        return False
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True  # headers and body go out in separate writes
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body, headers=()):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _throttled(self):
+        if self.server.over_limit():
+            self._send(429, {'errorMessages': ['Rate limit exceeded']}, [('Retry-After', '1')])
+            return True
+        return False
+
+    def do_GET(self):
+        time.sleep(self.server.latency)
+        if self._throttled():
+            return
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        if url.path == '/rest/api/2/myself':
+            return self._send(200, USER)
+        if url.path in ('/rest/api/2/worklog/updated', '/rest/api/2/worklog/deleted'):
+            since = int(query.get('since', ['0'])[0])
+            until = int(time.time() * 1000)
+            with self.server.lock:
+                values = [] if url.path.endswith('deleted') else \
+                    [{'worklogId': int(w['id']), 'updatedTime': w['updated']} for w in self.server.worklogs
+                     if since <= w['updated'] < until]
+            return self._send(200, {'values': values, 'since': since, 'until': until, 'lastPage': True})
+        if url.path != '/rest/api/2/search':
+            return self._send(404, {'errorMessages': ['Not found']})
+        start = int(query.get('startAt', ['0'])[0])
+        size = min(int(query.get('maxResults', ['50'])[0]), self.server.max_results)
+        issues = self.server.issues
+        if 'updated >=' in query.get('jql', [''])[0]:
+            issues = []  # nothing changed since the last sync
+        self._send(200, {'startAt': start, 'maxResults': size, 'total': len(issues),
+                         'issues': issues[start:start + size]})
+
+    def do_POST(self):
+        time.sleep(self.server.latency)
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if self._throttled():
+            return
+        path = urlparse(self.path).path
+        if path == '/rest/api/2/worklog/list':
+            ids = {str(i) for i in json.loads(body or b'{}').get('ids', [])}
+            with self.server.lock:
+                return self._send(200, [w for w in self.server.worklogs if w['id'] in ids])
+        parts = path.split('/')
+        if len(parts) != 7 or parts[-1] != 'worklog':
+            return self._send(404, {'errorMessages': ['Not found']})
+        payload = json.loads(body or b'{}')
+        with self.server.lock:
+            worklog = {'id': str(len(self.server.worklogs) + 1), 'issueId': self.server.issue_ids.get(parts[-2], parts[-2]),
+                       'author': USER, 'started': payload.get('started'), 'timeSpent': payload.get('timeSpent'),
+                       'timeSpentSeconds': _seconds(payload.get('timeSpent')), 'updated': int(time.time() * 1000)}
+            self.server.worklogs.append(worklog)
+        self._send(201, worklog)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--issues', type=int, default=500)
+    parser.add_argument('--latency', type=float, default=0.05, help='seconds added to every response')
+    parser.add_argument('--rate-limit', type=int, default=0, help='calls per second before answering 429')
+    args = parser.parse_args()
+    server = MockJira(args.issues, args.latency, port=args.port, rate_limit=args.rate_limit)
+    print(f'Mock JIRA on {server.url} with {args.issues} issues, {args.latency * 1000:.0f} ms latency')
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
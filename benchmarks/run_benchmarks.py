@@ -0,0 +1,146 @@
+"""
+Drive the real Flask routes against a local mock JIRA and a synthetic tracker workbook,
+reporting throughput and p50/p95/p99 latency per flow. Use --json to save a run for comparison.
+"""
+import argparse
+import datetime
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+from mock_jira import MockJira  # noqa: E402
+from synthetic_tracker import make_tracker  # noqa: E402
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def summarize(name, samples, wall):
+    ms = [s * 1000 for s in samples]
+    return {'scenario': name, 'requests': len(ms), 'throughput_rps': len(ms) / wall if wall else 0.0,
+            'mean_ms': sum(ms) / len(ms) if ms else 0.0, 'p50_ms': percentile(ms, 50),
+            'p95_ms': percentile(ms, 95), 'p99_ms': percentile(ms, 99)}
+
+
+def run_scenario(app, name, iterations, concurrency, request_fn):
+    """Run request_fn(client, i) `iterations` times spread over `concurrency` threads."""
+    samples = []
+    lock = threading.Lock()
+    counter = iter(range(iterations))
+
+    def worker():
+        client = app.test_client()
+        with client.session_transaction() as sess:
+            sess['JIRA_PAT'] = 'benchmark-pat'
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            start = time.perf_counter()
+            request_fn(client, i)
+            elapsed = time.perf_counter() - start
+            with lock:
+                samples.append(elapsed)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    wall = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return summarize(name, samples, time.perf_counter() - wall)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--issues', type=int, default=500, help='assigned issues served by the mock JIRA')
+    parser.add_argument('--latency', type=float, default=0.05, help='mock JIRA latency per call, seconds')
+    parser.add_argument('--rate-limit', type=int, default=0, help='mock JIRA calls per second before it answers 429')
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--years', type=int, default=2, help='years of rows in the synthetic tracker')
+    parser.add_argument('--people', type=int, default=20)
+    parser.add_argument('--lines', type=int, default=30, help='task lines per matching request')
+    parser.add_argument('--batch', type=int, default=20, help='worklogs per bulk logging request')
+    parser.add_argument('--json', help='write the results to this file')
+    args = parser.parse_args()
+    if args.json:
+        args.json = os.path.abspath(args.json)
+
+    server = MockJira(args.issues, args.latency, rate_limit=args.rate_limit).start()
+    os.environ['JIRA_DOMAIN'] = server.url
+    os.environ.pop('WORKLOG_JOBS_DB', None)
+    workdir = tempfile.mkdtemp(prefix='jira-bench-')
+    os.makedirs(os.path.join(workdir, 'jira'))
+    os.chdir(workdir)  # sanitize_filename resolves workbooks under ./jira
+    days, people = make_tracker(os.path.join(workdir, 'jira', 'tracker.xlsx'), years=args.years, people=args.people)
+
+    import flask_app  # noqa: E402  (after JIRA_DOMAIN points at the mock)
+    app = flask_app.app
+    app.testing = True
+    rng = random.Random(0)
+    keys = [issue['key'] for issue in server.issues]
+    paste = '\n'.join(f"- {rng.choice(['Author', 'Review'])} {rng.choice(['TC', 'TP', ''])} module_{rng.randrange(200)}"
+                      for _ in range(args.lines))
+
+    def listing(client, i):
+        client.get('/?fetch=1')
+
+    def listing_cold(client, i):
+        flask_app.task_cache.clear()
+        client.get('/?fetch=1')
+
+    def matching(client, i):
+        client.post('/process_read_tasks', data={'tasklist': paste})
+
+    def excel_lookup(client, i):
+        day = rng.choice(days)
+        client.post('/excel_log', data={'value1': rng.choice(people), 'value2': day.strftime('%d/%m/%Y'),
+                                        'file_path': 'tracker.xlsx'})
+
+    def bulk_logging(client, i):
+        # A distinct start per iteration, or the idempotency ledger would skip the repeats
+        started = (datetime.datetime(2024, 1, 1) + datetime.timedelta(minutes=i)).strftime('%H:%M %d-%m-%Y')
+        response = client.post('/log_time_multiple', data={'selected_tasks': rng.sample(keys, args.batch),
+                                                           'confirm': '1', 'time_spent': '1h', 'date_input': started})
+        progress_url = response.headers['Location'] + '/progress'
+        while not client.get(progress_url).get_json()['finished']:
+            time.sleep(0.005)
+
+    results = []
+    for name, fn, iterations in (('listing_cold', listing_cold, max(1, args.iterations // 5)),
+                                 ('listing_warm', listing, args.iterations),
+                                 ('matching', matching, args.iterations),
+                                 ('excel_lookup', excel_lookup, args.iterations),
+                                 ('bulk_logging', bulk_logging, max(1, args.iterations // 5))):
+        results.append(run_scenario(app, name, iterations, args.concurrency, fn))
+
+    print(f"{'scenario':<14}{'reqs':>6}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for r in results:
+        print(f"{r['scenario']:<14}{r['requests']:>6}{r['throughput_rps']:>10.1f}"
+              f"{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}{r['p99_ms']:>10.2f}")
+    print(f'worklogs posted: {len(server.worklogs)}, 429s served: {server.throttled}')
+    if args.json:
+        report = {'config': vars(args), 'worklogs_posted': len(server.worklogs), 'throttled': server.throttled,
+                  'results': results}
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,26 @@
+import datetime
+import random
+
+import pandas as pd
+
+VERBS = ['Author', 'Review', 'Rework']
+TYPES = ['TC', 'TP', 'TCs/TPs', '']
+
+
+def task_line(rng, bases):
+    return f"- {rng.choice(VERBS)} {rng.choice(TYPES)} {rng.choice(bases)}".replace('  ', ' ')
+
+
+def make_tracker(path, years=3, people=20, bases=200, lines_per_cell=3, sheet_name='Daily', seed=0):
+    """Write a synthetic daily tracker: a Days column plus one multi-line task cell per person and weekday."""
+    rng = random.Random(seed)
+    base_names = [f'module_{i}' for i in range(bases)]
+    start = datetime.date(2020, 1, 1)
+    days = [start + datetime.timedelta(days=i) for i in range(365 * years)]
+    days = [d for d in days if d.weekday() < 5]
+    data = {'Days': days}
+    for p in range(people):
+        data[f'Person {p}'] = ['\n'.join(task_line(rng, base_names) for _ in range(rng.randint(1, lines_per_cell)))
+                               for _ in days]
+    pd.DataFrame(data).to_excel(path, sheet_name=sheet_name, index=False)
+    return days, list(data)[1:]
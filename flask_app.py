@@ -1,17 +1,49 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, session
-import requests
+from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify, abort, g, Response
 import datetime
 import os
-import re
-import pandas as pd
-from jiraLogger import get_excel_entry
+from task_cache import TaskCache, pat_fingerprint
+from issue_store import ISSUE_STORE_DB, IssueStore
+from task_matcher import SummaryIndex, split_lines
+from task_list import SortedTasks
+from worklog_jobs import WorklogJobs
+from worklog_cache import WorklogCache, parse_started
+from time_spent import is_valid_time_spent, parse_time_spent, format_time_spent, format_seconds
+from jira_client import TRANSPORT_ERRORS, JiraError
+import jira_async
+import metrics
+import cProfile
+import io
+import pstats
+import time
+from concurrent.futures import ThreadPoolExecutor
 import pathlib
 from markupsafe import escape
 
 app = Flask(__name__)
 app.secret_key = 'asdasd'  # Replace with a random, secure value
 
-JIRA_DOMAIN = 'https://jira.critical.pt'
+# Issue keys and summaries kept on disk, so a restart serves task lists without waiting on JIRA
+issue_store = IssueStore(ISSUE_STORE_DB) if ISSUE_STORE_DB else None
+
+# Assigned issues per PAT, so page views don't each repeat the JIRA search
+task_cache = TaskCache(store=issue_store)
+
+# The user's own worklogs, checked before logging to flag duplicates and show day totals
+worklog_cache = WorklogCache()
+
+def worklogs_changed(pat):
+    """Logging bumps the issue's updated timestamp and adds a worklog; pick both up on the next read."""
+    task_cache.invalidate(pat)
+    worklog_cache.invalidate(pat)
+
+# Multi-task confirms are posted in the background; a refreshed task list picks up the new worklogs
+worklog_jobs = WorklogJobs(jira_async.post_worklog, on_success=worklogs_changed)
+
+# Workbook reads run here so they overlap with the JIRA fetch of the same request
+excel_executor = ThreadPoolExecutor(max_workers=int(os.getenv('EXCEL_WORKERS', '2')), thread_name_prefix='excel')
+
+# Per-request cProfile output is returned instead of the page when this is on and the X-Profile header is sent
+ENABLE_PROFILING = os.getenv('ENABLE_PROFILING') == '1'
 
 def get_pat():
     """Retrieve the JIRA Personal Access Token from session or environment."""
@@ -20,19 +52,33 @@ def get_pat():
         pat = os.getenv('JIRA_PAT')
     return pat
 
-def get_headers():
-    """Return headers for JIRA API requests, including authorization if available."""
-    pat = get_pat()
-    return {
-        'Authorization': f'Bearer {pat}' if pat else '',
-        'Accept': 'application/json',
-        'Content-Type': 'application/json',
-    }
+@app.before_request
+def start_request_timer():
+    """Start timing the request, and profiling it when asked to."""
+    g.request_started = time.perf_counter()
+    if ENABLE_PROFILING and request.headers.get('X-Profile'):
+        g.profiler = cProfile.Profile()
+        g.profiler.enable()
+
+@app.after_request
+def record_request_timing(response):
+    """Record the request latency; swap in the profile report for profiled requests."""
+    started = g.pop('request_started', None)
+    if started is not None:
+        metrics.http_request_seconds.observe(time.perf_counter() - started, endpoint=request.endpoint or 'unknown',
+                                             method=request.method, status=response.status_code)
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.disable()
+        report = io.StringIO()
+        pstats.Stats(profiler, stream=report).sort_stats('cumulative').print_stats(40)
+        return Response(report.getvalue(), mimetype='text/plain')
+    return response
 
 @app.before_request
 def require_pat():
-    """Require a JIRA PAT for all endpoints except set_pat and static files."""
-    if request.endpoint not in ('set_pat', 'static'):
+    """Require a JIRA PAT for all endpoints except set_pat, metrics and static files."""
+    if request.endpoint not in ('set_pat', 'metrics_endpoint', 'static'):
         pat = get_pat()
         if not pat:
             return redirect(url_for('set_pat'))
@@ -50,29 +96,107 @@ def set_pat():
             flash('Please enter a valid JIRA PAT.', 'danger')
     return render_template('set_pat.html')
 
+def issue_search(pat):
+    """Return search(jql) -> (issues, error) for the PAT; it needs no request context, so it can run in the background."""
+    def search(jql):
+        try:
+            return jira_async.search_all(pat, jql), None
+        except (JiraError, *TRANSPORT_ERRORS) as exc:
+            return [], f"Failed to fetch tasks: {exc}"
+    return search
+
+@metrics.timed('get_assigned_tasks')
 def get_assigned_tasks():
-    """Fetch all tasks assigned to the current user from JIRA."""
-    assigned_url = f'{JIRA_DOMAIN}/rest/api/2/search'
-    jql = 'assignee = currentUser() ORDER BY updated DESC'
-    params = {'jql': jql, 'maxResults': 100}
-    response = requests.get(assigned_url, headers=get_headers(), params=params)
-    if response.status_code != 200:
-        return [], f"Failed to fetch tasks: {response.status_code} {response.text}"
-    issues = response.json().get('issues', [])
-    return issues, None
+    """Fetch all tasks assigned to the current user, served from the per-user cache when warm."""
+    return task_cache.get(get_pat(), issue_search(get_pat()))
+
+def get_summary_index():
+    """Return the matcher's SummaryIndex over the current user's tasks, rebuilt only when they change."""
+    return task_cache.get_derived(get_pat(), issue_search(get_pat()), 'summary_index', SummaryIndex)
 
+@metrics.timed('log_work')
 def log_work(issue_key, time_spent, started):
     """Log work for a given JIRA issue key."""
-    worklog_url = f'{JIRA_DOMAIN}/rest/api/2/issue/{issue_key}/worklog'
-    worklog_payload = {
-        "started": started,
-        "timeSpent": time_spent
-    }
-    response = requests.post(worklog_url, headers=get_headers(), json=worklog_payload)
-    if response.status_code == 201:
-        return True, f"Successfully logged {time_spent} on {issue_key}"
-    else:
-        return False, f"Failed to log work: {response.status_code} {response.text}"
+    result = jira_async.post_worklog(get_pat(), issue_key, time_spent, started)
+    if result['ok']:
+        worklogs_changed(get_pat())
+    return result['ok'], result['message']
+
+def fetch_myself():
+    """Return (user, error) for the PAT owner."""
+    try:
+        return jira_async.get_myself(get_pat()), None
+    except (JiraError, *TRANSPORT_ERRORS) as exc:
+        return None, f"Failed to fetch the current user: {exc}"
+
+def fetch_worklog_changes(since):
+    """Return ((worklogs, deleted_ids, until), error) for worklogs changed since the epoch-ms `since`."""
+    try:
+        return jira_async.worklog_changes(get_pat(), since), None
+    except (JiraError, *TRANSPORT_ERRORS) as exc:
+        return None, f"Failed to fetch existing worklogs: {exc}"
+
+@metrics.timed('check_worklogs')
+def check_worklogs(entries, counted=None):
+    """
+    Compare planned (issue_key, time_spent, started) entries with the user's worklogs in JIRA.
+    Returns (duplicates, day_totals, error): the set of entry indexes that already exist there,
+    and one {day, logged, planned, total} row per day touched, durations formatted for display.
+    Only the entry indexes in `counted` (all when None) add to the planned time.
+    """
+    entries = list(entries)
+    starts = [parse_started(started) for _, _, started in entries]
+    if not any(starts):
+        return set(), [], None
+    worklogs, error = worklog_cache.get(get_pat(), min(s for s in starts if s), fetch_myself, fetch_worklog_changes)
+    if worklogs is None:
+        return set(), [], error
+    all_tasks, _ = get_assigned_tasks()
+    key_to_id = {t['key']: t.get('id') for t in all_tasks}
+    duplicates = set()
+    planned = {}
+    for i, ((key, time_spent, started), moment) in enumerate(zip(entries, starts)):
+        if moment is None:
+            continue
+        if key_to_id.get(key) and worklogs.is_logged(key_to_id[key], started):
+            duplicates.add(i)
+            continue
+        if counted is not None and i not in counted:
+            continue
+        hours, minutes = parse_time_spent(time_spent)
+        day = moment.astimezone(datetime.timezone.utc).date()
+        planned[day] = planned.get(day, 0) + hours * 3600 + minutes * 60
+    days = sorted(set(planned) | {moment.astimezone(datetime.timezone.utc).date() for moment in starts if moment})
+    day_totals = [{'day': day.strftime('%d/%m/%Y'), 'logged': format_seconds(worklogs.day_total(day)),
+                   'planned': format_seconds(planned.get(day, 0)),
+                   'total': format_seconds(worklogs.day_total(day) + planned.get(day, 0))} for day in days]
+    return duplicates, day_totals, error
+
+def started_from_input(date_input):
+    """JIRA start timestamp for an HH:MM DD-MM-YYYY form value (now when empty), or None if it doesn't parse."""
+    try:
+        if date_input:
+            return datetime.datetime.strptime(date_input, "%H:%M %d-%m-%Y").strftime('%Y-%m-%dT%H:%M:%S.000+0000')
+        return datetime.datetime.now().strftime('%Y-%m-%dT%H:%M:%S.000+0000')
+    except ValueError:
+        return None
+
+def enqueue_worklogs(entries):
+    """
+    Queue (issue_key, time_spent, started) entries as a background job and redirect to its progress page.
+    Entries already in JIRA are recorded as skipped instead of being posted again.
+    """
+    entries = list(entries)
+    duplicates, _, _ = check_worklogs(entries)
+    job_id = worklog_jobs.enqueue(get_pat(), entries, skipped=duplicates)
+    return redirect(url_for('job_status', job_id=job_id))
+
+def build_sorted_tasks(issues):
+    """SortedTasks for the current user, filtering through the issue store's full-text index when there is one."""
+    if issue_store is None:
+        return SortedTasks(issues)
+    user = pat_fingerprint(get_pat())
+    return SortedTasks(issues, search=lambda keyword: issue_store.search(user, keyword))
 
 @app.route('/', methods=['GET', 'POST'])
 def index():
@@ -81,30 +205,23 @@ def index():
     sort_by = request.args.get('sort_by', 'summary')
     sort_order = request.args.get('sort_order', 'desc')
     filter_keyword = request.form.get('filter', '').lower() if request.method == 'POST' else request.args.get('filter', '').lower()
-    tasks = []
-    error = None
     fetch_requested = (request.method == 'GET' and request.args.get('fetch') == '1')
     filter_requested = (request.method == 'POST' and filter_keyword) or (request.method == 'GET' and filter_keyword)
 
+    cursor = request.args.get('cursor', '')
+    next_cursor = None
+    total = 0
+
     if fetch_requested or filter_requested:
-        # Fetch from JIRA and do NOT store in session
-        tasks, error = get_assigned_tasks()
+        # Served from the cached task list; presorted views are rebuilt only when it changes
+        task_list, error = task_cache.get_derived(get_pat(), issue_search(get_pat()), 'sorted_tasks', build_sorted_tasks)
         if error:
             flash(error, 'danger')
-            tasks = []
-        if filter_keyword:
-            tasks = [t for t in tasks if filter_keyword in t['fields']['summary'].lower()]
+        tasks, next_cursor, total = task_list.page(sort_by, sort_order, filter_keyword, cursor)
     else:
         # If not fetching/filtering, do not use session, just show empty or prompt user to fetch
         tasks = []
-    # Sorting
-    if tasks:
-        reverse = (sort_order == 'desc')
-        if sort_by == 'summary':
-            tasks = sorted(tasks, key=lambda t: t['fields']['summary'].lower(), reverse=reverse)
-        else:
-            tasks = sorted(tasks, key=lambda t: t['key'], reverse=reverse)
-    return render_template('index.html', tasks=tasks, filter_keyword=filter_keyword, sort_by=sort_by, sort_order=sort_order)
+    return render_template('index.html', tasks=tasks, filter_keyword=filter_keyword, sort_by=sort_by, sort_order=sort_order, cursor=cursor, next_cursor=next_cursor, total=total)
 
 @app.route('/log_time/<issue_key>', methods=['GET', 'POST'])
 def log_time(issue_key):
@@ -125,12 +242,8 @@ def log_time(issue_key):
             return render_template('log_time.html', issue_key=issue_key, summary=summary, time_spent=time_spent, date_input=date_input, dry_run=True)
         elif 'confirm' in request.form:
             # Actually log time
-            try:
-                if date_input:
-                    started = datetime.datetime.strptime(date_input, "%H:%M %d-%m-%Y").strftime('%Y-%m-%dT%H:%M:%S.000+0000')
-                else:
-                    started = datetime.datetime.now().strftime('%Y-%m-%dT%H:%M:%S.000+0000')
-            except ValueError:
+            started = started_from_input(date_input)
+            if started is None:
                 flash("Invalid date format. Use HH:MM DD-MM-YYYY.", 'danger')
                 return render_template('log_time.html', issue_key=issue_key, summary=summary, time_spent=time_spent, date_input=date_input, dry_run=True)
             success, msg = log_work(issue_key, time_spent, started)
@@ -154,23 +267,22 @@ def log_time_multiple():
             # Actually log work after dry run
             time_spent = sanitize_text(request.form['time_spent'], max_length=20)
             date_input = sanitize_text(request.form['date_input'], max_length=30)
-            try:
-                if date_input:
-                    started = datetime.datetime.strptime(date_input, "%H:%M %d-%m-%Y").strftime('%Y-%m-%dT%H:%M:%S.000+0000')
-                else:
-                    started = datetime.datetime.now().strftime('%Y-%m-%dT%H:%M:%S.000+0000')
-            except ValueError:
+            started = started_from_input(date_input)
+            if started is None:
                 flash("Invalid date format. Use HH:MM DD-MM-YYYY.", 'danger')
                 return render_template('log_time_multiple.html', selected_tasks=selected_tasks, selected_task_info=selected_task_info, time_spent=time_spent, date_input=date_input, dry_run=True)
-            for issue_key in selected_tasks:
-                success, msg = log_work(issue_key, time_spent, started)
-                flash(msg, 'success' if success else 'danger')
-            return redirect(url_for('index'))
+            return enqueue_worklogs((issue_key, time_spent, started) for issue_key in selected_tasks)
         elif 'time_spent' in request.form:
-            # Always show dry run before logging
+            # Always show dry run before logging, flagging what JIRA already has
             time_spent = sanitize_text(request.form['time_spent'], max_length=20)
             date_input = sanitize_text(request.form['date_input'], max_length=30)
-            return render_template('log_time_multiple.html', selected_tasks=selected_tasks, selected_task_info=selected_task_info, time_spent=time_spent, date_input=date_input, dry_run=True)
+            duplicates, day_totals = set(), []
+            started = started_from_input(date_input)
+            if started:
+                duplicates, day_totals, error = check_worklogs((key, time_spent, started) for key in selected_tasks)
+                if error:
+                    flash(error, 'warning')
+            return render_template('log_time_multiple.html', selected_tasks=selected_tasks, selected_task_info=selected_task_info, time_spent=time_spent, date_input=date_input, dry_run=True, duplicates=duplicates, day_totals=day_totals)
         else:
             now = datetime.datetime.now().strftime('%H:%M %d-%m-%Y')
             return render_template('log_time_multiple.html', selected_tasks=selected_tasks, selected_task_info=selected_task_info, date_input=now)
@@ -180,19 +292,6 @@ def log_time_multiple():
 @app.route('/log_time_multiple_individual', methods=['GET', 'POST'])
 def log_time_multiple_individual():
     """Log time for multiple JIRA issues, each with individual time/date."""
-    def is_valid_time_spent(val):
-        """Check if the time spent string is valid (e.g. 1h, 10m, 1h10m)."""
-        return bool(re.fullmatch(r'([0-9]+h)?([0-9]+m)?', val.strip())) and val.strip() != ''
-
-    def parse_time_spent(val):
-        """Parse a time spent string into hours and minutes as integers."""
-        match = re.fullmatch(r'(?:(\d+)h)?(?:(\d+)m)?', val.strip())
-        if not match:
-            return 0, 0
-        hours = int(match.group(1)) if match.group(1) else 0
-        minutes = int(match.group(2)) if match.group(2) else 0
-        return hours, minutes
-
     if request.method == 'POST':
         selected_tasks = [sanitize_text(k, max_length=20) for k in request.form.getlist('selected_tasks')]
         if not selected_tasks:
@@ -211,39 +310,32 @@ def log_time_multiple_individual():
                 # Validate input
                 if not time_spent or not is_valid_time_spent(time_spent):
                     status = 'Invalid time (use e.g. 1h10m, 10m, 2h)'
-                try:
-                    if date_input:
-                        datetime.datetime.strptime(date_input, "%H:%M %d-%m-%Y")
-                except Exception:
+                if started_from_input(date_input) is None:
                     status = 'Invalid date'
-                per_task_data.append({'key': key, 'summary': key_to_summary.get(key, ''), 'time_spent': time_spent, 'date_input': date_input, 'status': status})
-            return render_template('log_time_multiple_individual.html', selected_tasks=selected_tasks, selected_task_info=selected_task_info, per_task_data=per_task_data, dry_run=True)
+                per_task_data.append({'key': key, 'summary': key_to_summary.get(key, ''), 'time_spent': time_spent, 'date_input': date_input, 'status': status, 'duplicate': False})
+            valid = [(i, t) for i, t in enumerate(per_task_data) if t['status'] == 'ok']
+            duplicates, day_totals, error = check_worklogs((t['key'], t['time_spent'], started_from_input(t['date_input'])) for _, t in valid)
+            if error:
+                flash(error, 'warning')
+            for j in duplicates:
+                per_task_data[valid[j][0]]['duplicate'] = True
+            return render_template('log_time_multiple_individual.html', selected_tasks=selected_tasks, selected_task_info=selected_task_info, per_task_data=per_task_data, dry_run=True, day_totals=day_totals)
         elif 'confirm' in request.form:
-            # Actually log work for all tasks
+            # Validate every task first, then log them all as one concurrent batch
+            entries = []
             for key in selected_tasks:
                 time_spent = sanitize_text(request.form.get(f'time_spent_{key}'), max_length=20)
                 date_input = sanitize_text(request.form.get(f'date_input_{key}'), max_length=30)
                 if not time_spent or not is_valid_time_spent(time_spent):
                     flash(f"Invalid time for {key}. Use e.g. 1h10m, 10m, 2h", 'danger')
                     return redirect(request.url)
-                # If only hours, add 0m for display/logging clarity
-                hours, minutes = parse_time_spent(time_spent)
-                formatted_time_spent = ''
-                if hours:
-                    formatted_time_spent += f'{hours}h'
-                if minutes or not hours:
-                    formatted_time_spent += f'{minutes}m'
-                try:
-                    if date_input:
-                        started = datetime.datetime.strptime(date_input, "%H:%M %d-%m-%Y").strftime('%Y-%m-%dT%H:%M:%S.000+0000')
-                    else:
-                        started = datetime.datetime.now().strftime('%Y-%m-%dT%H:%M:%S.000+0000')
-                except ValueError:
+                formatted_time_spent = format_time_spent(time_spent)
+                started = started_from_input(date_input)
+                if started is None:
                     flash(f"Invalid date format for {key}. Use HH:MM DD-MM-YYYY.", 'danger')
                     return redirect(request.url)
-                success, msg = log_work(key, formatted_time_spent, started)
-                flash(msg, 'success' if success else 'danger')
-            return redirect(url_for('index'))
+                entries.append((key, formatted_time_spent, started))
+            return enqueue_worklogs(entries)
         else:
             return render_template('log_time_multiple_individual.html', selected_tasks=selected_tasks, selected_task_info=selected_task_info)
     else:
@@ -282,6 +374,8 @@ def excel_log():
         value2 = sanitize_text(request.form.get('value2', ''))  # Date
         file_path = sanitize_filename(request.form.get('file_path', file_path))
         if value1 and value2 and file_path:
+            # tracker_excel brings in pandas, so it is only imported once an Excel page is used
+            from tracker_excel import get_excel_entry
             cell = get_excel_entry(value2, value1, file_path=file_path)
             result = cell
     return render_template('excel_log.html', value1=value1, value2=value2, file_path=file_path, result=result)
@@ -294,70 +388,14 @@ def read_tasks():
 @app.route('/process_read_tasks', methods=['POST'])
 def process_read_tasks():
     """Process pasted task lines, match to JIRA summaries, and redirect to log page."""
-    import re
     input_text = request.form.get('tasklist', '')
     if not input_text:
         flash('No tasks provided.', 'danger')
         return redirect(url_for('read_tasks'))
 
-    lines = [line.strip('-').strip() for line in input_text.splitlines() if line.strip()]
-    all_tasks, _ = get_assigned_tasks()
-    summary_to_key = {t['fields']['summary']: t['key'] for t in all_tasks}
-    matched_keys = set()
-
-    for line in lines:
-        lowered = line.lower()
-
-        # Extract verb
-        verb_match = re.search(r'\b(author|review|rework)\b', lowered)
-        verb = verb_match.group(1).capitalize() if verb_match else None
-
-        # Normalize verb to task summary keyword
-        if verb in ['Author', 'Rework']:
-            summary_verb = 'Authoring'
-        elif verb == 'Review':
-            summary_verb = 'Review'
-        else:
-            continue  # skip if verb not found
-
-        # Extract type and base
-        match = re.search(
-            r'\b(?:author|review|rework)[^a-zA-Z0-9]*\d*\s*(tcs?/tps?|tps?/tcs?|tcs?|tps?)?\s*([a-zA-Z0-9_]+)\s*$',
-            lowered,
-            re.IGNORECASE
-        )
-        if not match:
-            continue  # skip invalid line
-
-        type_indicator = match.group(1)
-        base = match.group(2)
-
-        # Determine types to match
-        if type_indicator and 'tc' in type_indicator.lower() and 'tp' in type_indicator.lower():
-            types_to_check = ['TC', 'TP']
-        elif type_indicator:
-            if 'tc' in type_indicator.lower():
-                types_to_check = ['TC']
-            elif 'tp' in type_indicator.lower():
-                types_to_check = ['TP']
-            else:
-                types_to_check = [None]
-        else:
-            types_to_check = [None]
-
-        # Match task summaries
-        for summary, key in summary_to_key.items():
-            normalized_summary = re.sub(r'\s+', ' ', summary)
-            if summary_verb not in normalized_summary:
-                continue
-            if base.lower() not in normalized_summary.lower():
-                continue
-            if types_to_check == [None]:
-                matched_keys.add(key)
-            else:
-                for typ in types_to_check:
-                    if re.search(r'\b' + re.escape(typ) + r'\b', normalized_summary):
-                        matched_keys.add(key)
+    lines = split_lines(input_text)
+    summary_index, _ = get_summary_index()
+    matched_keys = summary_index.match_lines(lines)
 
     if not matched_keys:
         flash('No valid tasks found from input.', 'danger')
@@ -375,56 +413,121 @@ def log_from_excel_cell():
     if not value1 or not value2 or not file_path:
         flash('Name, date, and file path are required.', 'danger')
         return redirect(url_for('excel_log'))
-    cell = get_excel_entry(value2, value1, file_path=file_path)
+    from tracker_excel import get_excel_entry
+    # Read the workbook while the task list is fetched from JIRA
+    cell_future = excel_executor.submit(get_excel_entry, value2, value1, file_path=file_path)
+    summary_index, _ = get_summary_index()
+    cell = cell_future.result()
     if not cell:
         flash('No cell data found.', 'danger')
         return redirect(url_for('excel_log'))
     # Parse tasks from cell (split by lines, remove empty)
-    lines = [line.strip('-').strip() for line in str(cell).splitlines() if line.strip()]
-    all_tasks, _ = get_assigned_tasks()
-    summary_to_key = {t['fields']['summary']: t['key'] for t in all_tasks}
-    matched_keys = set()
-    for line in lines:
-        lowered = line.lower()
-        # Extract verb (author, review, rework)
-        verb_match = re.search(r'\b(author|review|rework)\b', lowered)
-        verb = verb_match.group(1).capitalize() if verb_match else None
-        verb_map = {'Author': 'Authoring', 'Review': 'Review', 'Rework': 'Authoring'}
-        summary_verb = verb_map.get(verb, None)
-        if summary_verb:
-            match = re.search(r'(?:' + verb.lower() + r')[^a-zA-Z0-9]*\d*\s*(?:tcs?/tps?|tps?/tcs?|tcs?|tps?)?\s*([a-zA-Z0-9_]+)\s*$', line, re.IGNORECASE)
-            if match:
-                base = match.group(1)
-                has_tc = re.search(r'\bTCs?\b', line, re.IGNORECASE)
-                has_tp = re.search(r'\bTPs?\b', line, re.IGNORECASE)
-                has_both = re.search(r'(TCs?/TPs?|TPs?/TCs?)', line, re.IGNORECASE)
-                types_to_check = []
-                if has_both or (has_tc and has_tp):
-                    types_to_check = ['TC', 'TP']
-                elif has_tc:
-                    types_to_check = ['TC']
-                elif has_tp:
-                    types_to_check = ['TP']
-                else:
-                    types_to_check = [None]
-                for typ in types_to_check:
-                    for summary, key in summary_to_key.items():
-                        if summary_verb in summary and base.lower() in summary.lower():
-                            if typ:
-                                if re.search(r'\b' + typ + r'\b', summary):
-                                    matched_keys.add(key)
-                            else:
-                                matched_keys.add(key)
-        else:
-            for summary, key in summary_to_key.items():
-                if line.lower() in summary.lower():
-                    matched_keys.add(key)
+    lines = split_lines(cell)
+    # Lines without a verb fall back to matching the whole line against summaries
+    matched_keys = summary_index.match_lines(lines, substring_fallback=True)
     if not matched_keys:
         flash('No valid tasks found in Excel cell.', 'danger')
         return redirect(url_for('excel_log'))
     # Pass the searched date as default_date to the log_time_multiple_individual page
     return redirect(url_for('log_time_multiple_individual', **{'selected_tasks': list(matched_keys), 'default_date': value2}))
 
+@app.route('/excel_range', methods=['GET', 'POST'])
+def excel_range():
+    """Build a multi-day worklog plan from one person's tracker cells over a date range, then log it as one batch."""
+    value1 = ''
+    start_date = ''
+    end_date = ''
+    default_time = ''
+    file_path = 'BSP-G2_Daily_Tracker.xlsx'
+    plan = []
+    day_totals = []
+    dry_run = False
+    if request.method == 'POST':
+        value1 = sanitize_text(request.form.get('value1', ''))  # Name
+        start_date = sanitize_text(request.form.get('start_date', ''))
+        end_date = sanitize_text(request.form.get('end_date', ''))
+        default_time = sanitize_text(request.form.get('default_time', ''), max_length=20)
+        file_path = sanitize_filename(request.form.get('file_path', file_path))
+        if 'dry_run' in request.form or 'confirm' in request.form:
+            # Re-validate the reviewed plan; only checked rows are logged
+            dry_run = True
+            included = set(request.form.getlist('entry_include'))
+            rows = zip(request.form.getlist('entry_key'), request.form.getlist('entry_summary'),
+                       request.form.getlist('entry_day'), request.form.getlist('entry_time_spent'),
+                       request.form.getlist('entry_date_input'))
+            for i, (key, summary, day, time_spent, date_input) in enumerate(rows):
+                entry = {'key': sanitize_text(key, max_length=20), 'summary': sanitize_text(summary, max_length=255),
+                         'day': sanitize_text(day, max_length=10), 'time_spent': sanitize_text(time_spent, max_length=20),
+                         'date_input': sanitize_text(date_input, max_length=30), 'include': str(i) in included,
+                         'status': 'ok', 'started': started_from_input(date_input) if date_input else None}
+                entry['time_ok'] = bool(entry['time_spent']) and is_valid_time_spent(entry['time_spent'])
+                if entry['include']:
+                    if not entry['time_ok']:
+                        entry['status'] = 'Invalid time (use e.g. 1h10m, 10m, 2h)'
+                    if entry['started'] is None:
+                        entry['status'] = 'Invalid date'
+                plan.append(entry)
+            selected = [e for e in plan if e['include']]
+            if 'confirm' in request.form and selected and all(e['status'] == 'ok' for e in selected):
+                return enqueue_worklogs((e['key'], format_time_spent(e['time_spent']), e['started']) for e in selected)
+            if not selected:
+                flash('No entries selected.', 'danger')
+            # Unchecked rows are compared too, so those already in JIRA stay labelled; only checked ones count toward the totals
+            checkable = [e for e in plan if e['time_ok'] and e['started']]
+            duplicates, day_totals, error = check_worklogs(((e['key'], e['time_spent'], e['started']) for e in checkable),
+                                                           counted={j for j, e in enumerate(checkable) if e['include']})
+            if error:
+                flash(error, 'warning')
+            for j in duplicates:
+                checkable[j]['duplicate'] = True
+        elif value1 and start_date and end_date and file_path:
+            from tracker_excel import get_excel_range
+            # Read the workbook while the task list is fetched from JIRA
+            days_future = excel_executor.submit(get_excel_range, start_date, end_date, value1, file_path=file_path)
+            summary_index, _ = get_summary_index()
+            days, error = days_future.result()
+            if error:
+                flash(error, 'danger')
+            else:
+                for day, cell in days:
+                    keys = summary_index.match_lines(split_lines(cell), substring_fallback=True)
+                    for key in sorted(keys):
+                        plan.append({'key': key, 'summary': summary_index.summaries.get(key, ''),
+                                     'day': day.strftime('%d/%m/%Y'), 'time_spent': default_time,
+                                     'date_input': day.strftime('09:00 %d-%m-%Y'), 'include': True, 'status': 'ok'})
+                if not plan:
+                    flash('No valid tasks found in the selected range.', 'danger')
+                # Days imported before are left unchecked
+                duplicates, day_totals, error = check_worklogs((e['key'], e['time_spent'], started_from_input(e['date_input'])) for e in plan)
+                if error:
+                    flash(error, 'warning')
+                for j in duplicates:
+                    plan[j].update(duplicate=True, include=False)
+        else:
+            flash('Name, start date, end date, and file path are required.', 'danger')
+    return render_template('excel_range.html', value1=value1, start_date=start_date, end_date=end_date, default_time=default_time, file_path=file_path, plan=plan, dry_run=dry_run, day_totals=day_totals)
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """Show the progress of a background worklog job."""
+    progress = worklog_jobs.progress(sanitize_text(job_id, max_length=32), get_pat())
+    if progress is None:
+        abort(404)
+    return render_template('job_status.html', job=progress)
+
+@app.route('/jobs/<job_id>/progress', methods=['GET'])
+def job_progress(job_id):
+    """Per-issue status of a background worklog job, as JSON."""
+    progress = worklog_jobs.progress(sanitize_text(job_id, max_length=32), get_pat())
+    if progress is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    return jsonify(progress)
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Expose JIRA call, hot-path and request latency metrics in the Prometheus text format."""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
 def sanitize_filename(filename):
     """Allow only filenames under the jira directory, no path traversal."""
     base_dir = pathlib.Path('jira').resolve()
@@ -1,21 +1,22 @@
-import pandas as pd
+import datetime
+
+import tracker_stream
 
 def get_excel_entry(date_str, name, file_path='BSP-G2_Daily_Tracker.xlsx', sheet_name='Daily'):
     """
     Returns the cell value for the given name (column) on the given date (DD/MM/YYYY) from the Excel file.
+    Streams the sheet without pandas, so a one-off lookup does not pay for importing it.
     """
     try:
-        date_obj = pd.to_datetime(date_str, format='%d/%m/%Y', dayfirst=True)
-    except Exception:
+        date_obj = datetime.datetime.strptime(date_str, '%d/%m/%Y').date()
+    except ValueError:
         return "Invalid date format. Use DD/MM/YYYY."
-    df = pd.read_excel(file_path, sheet_name=sheet_name)
-    df['Days'] = pd.to_datetime(df['Days'], errors='coerce')
-    if name not in df.columns:
+    has_column, found, value = tracker_stream.lookup(file_path, sheet_name, date_obj, name)
+    if not has_column:
         return f"No column named '{name}' in sheet '{sheet_name}'."
-    row = df[df['Days'].dt.date == date_obj.date()]
-    if row.empty:
+    if not found:
         return f"No entry found for date {date_str}."
-    return row[name].values[0]
+    return value
 
 if __name__ == "__main__":
     date_input = input("Enter date (DD/MM/YYYY): ")
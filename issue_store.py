@@ -0,0 +1,98 @@
+import os
+import sqlite3
+import threading
+
+# === CONFIG ===
+ISSUE_STORE_DB = os.getenv('ISSUE_STORE_DB')  # optional SQLite file; task lists are only kept in memory when unset
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS issues (
+    user TEXT, key TEXT, id TEXT, summary TEXT, updated TEXT, PRIMARY KEY (user, key)
+);
+CREATE TABLE IF NOT EXISTS syncs (user TEXT PRIMARY KEY, synced_at REAL, full_synced_at REAL);
+'''
+
+# Trigram tokens make a quoted phrase match any substring, like the views' keyword filters
+FTS_SCHEMA = '''
+CREATE VIRTUAL TABLE IF NOT EXISTS issues_fts USING fts5(
+    summary, content='issues', content_rowid='rowid', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS issues_ai AFTER INSERT ON issues BEGIN
+    INSERT INTO issues_fts(rowid, summary) VALUES (new.rowid, new.summary);
+END;
+CREATE TRIGGER IF NOT EXISTS issues_ad AFTER DELETE ON issues BEGIN
+    INSERT INTO issues_fts(issues_fts, rowid, summary) VALUES ('delete', old.rowid, old.summary);
+END;
+CREATE TRIGGER IF NOT EXISTS issues_au AFTER UPDATE ON issues BEGIN
+    INSERT INTO issues_fts(issues_fts, rowid, summary) VALUES ('delete', old.rowid, old.summary);
+    INSERT INTO issues_fts(rowid, summary) VALUES (new.rowid, new.summary);
+END;
+'''
+
+
+def _like_pattern(text):
+    return '%' + text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
+
+class IssueStore:
+    """
+    On-disk copy of each user's assigned issues (key, id, summary, updated), keyed by PAT
+    fingerprint, with a full-text index on summary.
+
+    TaskCache loads a user's list from here on first use after a start, so pages are served
+    before JIRA answers, and writes every sync back. SQLite builds without FTS5 fall back to
+    scanning the table.
+    """
+
+    def __init__(self, path):
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.executescript(SCHEMA)
+        try:
+            self.db.executescript(FTS_SCHEMA)
+            self.fts = True
+        except sqlite3.OperationalError:
+            self.fts = False
+        self._lock = threading.Lock()
+
+    def load(self, user):
+        """Return (issues, synced_at, full_synced_at) for a user, most recently updated first; ([], 0, 0) if unknown."""
+        with self._lock:
+            sync = self.db.execute('SELECT synced_at, full_synced_at FROM syncs WHERE user = ?', (user,)).fetchone()
+            if sync is None:
+                return [], 0.0, 0.0
+            rows = self.db.execute('SELECT key, id, summary, updated FROM issues WHERE user = ? ORDER BY updated DESC',
+                                   (user,)).fetchall()
+        issues = [{'key': key, 'id': issue_id, 'fields': {'summary': summary, 'updated': updated}}
+                  for key, issue_id, summary, updated in rows]
+        return issues, sync[0], sync[1]
+
+    def save(self, user, issues, synced_at, full_synced_at, full=False):
+        """Upsert a user's synced issues; a full sync also drops the ones no longer assigned."""
+        rows = [(user, issue['key'], issue.get('id'), issue['fields'].get('summary', ''),
+                 issue['fields'].get('updated', '')) for issue in issues]
+        with self._lock, self.db:
+            if full:
+                self.db.execute('CREATE TEMP TABLE IF NOT EXISTS synced_keys (key TEXT PRIMARY KEY)')
+                self.db.execute('DELETE FROM synced_keys')
+                self.db.executemany('INSERT OR IGNORE INTO synced_keys VALUES (?)', [(row[1],) for row in rows])
+                self.db.execute('DELETE FROM issues WHERE user = ? AND key NOT IN (SELECT key FROM synced_keys)', (user,))
+            self.db.executemany(
+                'INSERT INTO issues VALUES (?, ?, ?, ?, ?) ON CONFLICT(user, key) DO UPDATE SET '
+                'id = excluded.id, summary = excluded.summary, updated = excluded.updated '
+                'WHERE summary IS NOT excluded.summary OR updated IS NOT excluded.updated', rows)
+            self.db.execute('INSERT OR REPLACE INTO syncs VALUES (?, ?, ?)', (user, synced_at, full_synced_at))
+
+    def search(self, user, text):
+        """Keys of the user's issues whose summary contains `text`, case-insensitively."""
+        with self._lock:
+            if self.fts and len(text) >= 3:
+                # Trigram phrases need three characters; shorter text scans the table instead
+                # A subquery, not a join: joined, SQLite re-runs the full-text query for every row
+                rows = self.db.execute(
+                    'SELECT key FROM issues WHERE rowid IN (SELECT rowid FROM issues_fts WHERE issues_fts MATCH ?) '
+                    'AND user = ?', ('"' + text.replace('"', '""') + '"', user))
+            else:
+                pattern = _like_pattern(text)
+                rows = self.db.execute("SELECT key FROM issues WHERE user = ? AND summary LIKE ? ESCAPE '\\'",
+                                       (user, pattern))
+            return {row[0] for row in rows}
@@ -1,55 +1,31 @@
-import requests
-import datetime
 import os
-import time
-import pandas as pd
+from jira_client import JiraError, get_client
+import metrics
 
 # === CONFIG ===
-JIRA_DOMAIN = 'https://jira.critical.pt'
 PAT = os.getenv('JIRA_PAT')  # Ensure you export JIRA_PAT in your bashrc
-
-HEADERS = {
-    'Authorization': f'Bearer {PAT}',
-    'Accept': 'application/json',
-    'Content-Type': 'application/json',
-}
+EXCEL_FUNCTIONS = ('get_excel_entry', 'build_excel_sidecar', 'get_excel_range', 'get_excel_tasks')
 
 # === FUNCTIONS ===
-def get_assigned_tasks():
-    assigned_url = f'{JIRA_DOMAIN}/rest/api/2/search'
+def iter_assigned_tasks(pat=None):
+    """Stream every issue assigned to the PAT owner (JIRA_PAT unless given), page by page."""
     jql = 'assignee = currentUser() ORDER BY updated DESC'
-    params = {'jql': jql, 'maxResults': 100}
+    return get_client().iter_issues(pat or PAT, jql)
 
-    response = requests.get(assigned_url, headers=HEADERS, params=params)
-    if response.status_code != 200:
+@metrics.timed('jiraLogger.get_assigned_tasks')
+def get_assigned_tasks():
+    try:
+        return list(iter_assigned_tasks())
+    except JiraError:
         return []
 
-    issues = response.json().get('issues', [])
-    return issues
-
+@metrics.timed('jiraLogger.log_work')
 def log_work(issue_key, time_spent, started):
-    worklog_url = f'{JIRA_DOMAIN}/rest/api/2/issue/{issue_key}/worklog'
-    worklog_payload = {
-        "started": started,
-        "timeSpent": time_spent
-    }
-
-    response = requests.post(worklog_url, headers=HEADERS, json=worklog_payload)
-    return response.status_code == 201
-
-def get_excel_entry(date_str, name, file_path='BSP-G2_Daily_Tracker.xlsx', sheet_name='Daily'):
-    """
-    Returns the cell value for the given name (column) on the given date (DD/MM/YYYY) from the Excel file.
-    """
-    try:
-        date_obj = pd.to_datetime(date_str, format='%d/%m/%Y', dayfirst=True)
-    except Exception:
-        return "Invalid date format. Use DD/MM/YYYY."
-    df = pd.read_excel(file_path, sheet_name=sheet_name)
-    df['Days'] = pd.to_datetime(df['Days'], errors='coerce')
-    if name not in df.columns:
-        return f"No column named '{name}' in sheet '{sheet_name}'."
-    row = df[df['Days'].dt.date == date_obj.date()]
-    if row.empty:
-        return f"No entry found for date {date_str}."
-    return row[name].values[0]
\ No newline at end of file
+    return get_client().post_worklog(PAT, issue_key, time_spent, started)['ok']
+
+def __getattr__(name):
+    # The tracker functions live in tracker_excel, which pulls in pandas; load it on first use only
+    if name in EXCEL_FUNCTIONS:
+        import tracker_excel
+        return getattr(tracker_excel, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
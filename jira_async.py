@@ -0,0 +1,84 @@
+import asyncio
+import os
+import threading
+
+from jira_client import AsyncJiraClient, get_client, httpx
+
+# === CONFIG ===
+# Route JIRA I/O through one background event loop when httpx is installed; set JIRA_ASYNC=0 to opt out
+JIRA_ASYNC = os.getenv('JIRA_ASYNC', '1') != '0' and httpx is not None
+
+
+class JiraRuntime:
+    """
+    One daemon thread running an asyncio loop that owns a shared AsyncJiraClient.
+
+    Request threads hand coroutines to the loop and wait on the result, so every page
+    fetch and worklog post of every concurrent user is multiplexed on the same loop and
+    connection pool, instead of each request spinning up its own worker threads.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name='jira-async', daemon=True)
+        self.thread.start()
+        self.client = self.run(self._make_client())
+
+    async def _make_client(self):
+        return AsyncJiraClient()
+
+    def submit(self, coro):
+        """Schedule a coroutine on the loop and return a concurrent.futures.Future."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout=None):
+        """Run a coroutine on the loop and block the calling thread until it finishes."""
+        return self.submit(coro).result(timeout)
+
+
+_runtime = None
+_runtime_lock = threading.Lock()
+
+
+def get_runtime():
+    """Return the process-wide JiraRuntime, or None when the async path is disabled or httpx is missing."""
+    global _runtime
+    if not JIRA_ASYNC:
+        return None
+    if _runtime is None:
+        with _runtime_lock:
+            if _runtime is None:
+                _runtime = JiraRuntime()
+    return _runtime
+
+
+def search_all(pat, jql):
+    """Return every issue matching `jql`, on the event loop when available. Raises JiraError."""
+    runtime = get_runtime()
+    if runtime is None:
+        return list(get_client().iter_issues(pat, jql))
+    return runtime.run(runtime.client.search_all(pat, jql))
+
+
+def post_worklog(pat, issue_key, time_spent, started):
+    """Post one worklog; returns the result dict."""
+    runtime = get_runtime()
+    if runtime is None:
+        return get_client().post_worklog(pat, issue_key, time_spent, started)
+    return runtime.run(runtime.client.post_worklog(pat, issue_key, time_spent, started))
+
+
+def get_myself(pat):
+    """Return the PAT owner's user record. Raises JiraError."""
+    runtime = get_runtime()
+    if runtime is None:
+        return get_client().get_myself(pat)
+    return runtime.run(runtime.client.get_myself(pat))
+
+
+def worklog_changes(pat, since):
+    """Return (worklogs, deleted_ids, until) changed since the epoch-ms `since`. Raises JiraError."""
+    runtime = get_runtime()
+    if runtime is None:
+        return get_client().worklog_changes(pat, since)
+    return runtime.run(runtime.client.worklog_changes(pat, since))
@@ -0,0 +1,318 @@
+"""
+Log work from a worklog plan or from the tracker without the web app, e.g. from cron.
+
+  python jira_batch.py plan worklogs.csv --dry-run --report -
+  python jira_batch.py tracker --name "Pedro Serrano" --start 01/09/2025 --end 05/09/2025 --time 1h
+
+Plan files are CSV, JSON (a list, or one object per line) or xlsx, one worklog per row:
+  issue       issue key, or
+  task        a task line as written in the tracker, matched against the user's assigned issues
+  time_spent  e.g. 1h30m (defaults to --time)
+  started     HH:MM DD-MM-YYYY, DD/MM/YYYY (logged at --start-time) or a JIRA timestamp
+  pat_env     optional: environment variable holding the PAT to log as (default JIRA_PAT)
+In tracker mode --name may be given once per person, as NAME or NAME=PAT_ENV.
+
+Rows already logged in JIRA are skipped. Exit codes: 0 everything logged (or would be),
+1 JIRA rejected or could not take some worklogs (or timed out, status unknown: check
+JIRA before running again), 2 bad arguments or unreadable input,
+3 some rows were invalid or matched no task (the rest were still logged unless --strict).
+"""
+import argparse
+import csv
+import datetime
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+
+import jiraLogger
+from jira_client import WORKLOG_MAX_WORKERS, JiraError, get_client
+from task_matcher import SummaryIndex, split_lines
+from time_spent import format_time_spent, is_valid_time_spent
+from worklog_cache import WorklogCache, parse_started
+
+# === CONFIG ===
+DEFAULT_PAT_ENV = 'JIRA_PAT'
+STARTED_FORMAT = '%Y-%m-%dT%H:%M:%S.000+0000'  # what the web app sends
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_INCOMPLETE = 3
+
+
+class BatchError(Exception):
+    """Bad arguments or input; reported on stderr with EXIT_USAGE."""
+
+
+# === INPUT ===
+def _clean(row):
+    return {str(k).strip().lower(): '' if v is None else str(v).strip() for k, v in row.items()}
+
+
+def _excel_cell(value):
+    """A typed xlsx date as the text to_started reads: DD/MM/YYYY, or HH:MM DD-MM-YYYY when it has a time."""
+    if isinstance(value, datetime.datetime):
+        return value.strftime('%d/%m/%Y' if value.time() == datetime.time() else '%H:%M %d-%m-%Y')
+    return value
+
+
+def read_plan(path, fmt=None):
+    """Yield the rows of a CSV, JSON or xlsx plan as dicts with lower-cased column names."""
+    fmt = (fmt or os.path.splitext(path)[1].lstrip('.')).lower()
+    if fmt == 'csv':
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            for row in csv.DictReader(f):
+                yield _clean(row)
+    elif fmt in ('json', 'jsonl'):
+        with open(path, encoding='utf-8') as f:
+            text = f.read()
+        if text.lstrip().startswith('['):
+            rows = json.loads(text)
+        else:
+            rows = (json.loads(line) for line in text.splitlines() if line.strip())
+        for row in rows:
+            yield _clean(row)
+    elif fmt in ('xlsx', 'xlsm', 'xls'):
+        import pandas as pd
+        for row in pd.read_excel(path, dtype=object).fillna('').to_dict('records'):
+            yield _clean({k: _excel_cell(v) for k, v in row.items()})
+    else:
+        raise BatchError(f"Unsupported plan format '{fmt}'; use csv, json, jsonl or xlsx.")
+
+
+def tracker_rows(names, start, end, time_spent, file_path, sheet_name, users):
+    """
+    Yield plan rows for each person's tracker days, reading the sheet once for everyone. Task
+    lines are matched in bulk against the person's assigned issues: one row per matched issue
+    and day, or a row carrying the day's lines when nothing matched, so it is reported.
+    """
+    import tracker_excel
+    import tracker_tasks
+    specs = [(name.strip(), pat_env.strip()) for name, _, pat_env in (spec.partition('=') for spec in names)]
+    tasks, error = tracker_excel.get_excel_tasks(start, end, [name for name, _ in specs],
+                                                 file_path=file_path, sheet_name=sheet_name)
+    if error:
+        raise BatchError(error)
+    for name, pat_env in specs:
+        person = tasks[tasks['person'] == name]
+        user = users(pat_env or DEFAULT_PAT_ENV)
+        keys = {}
+        if user.pat and not person.empty:
+            matched = tracker_tasks.match_tasks(person, user.load(), substring_fallback=True)
+            for day, key in zip(matched['date'], matched['key']):
+                keys.setdefault(day, set()).add(key)
+        for day, lines in person.groupby('date', sort=True)['line']:
+            row = {'source': f"{name} {day.strftime('%d/%m/%Y')}", 'task': '\n'.join(lines),
+                   'time_spent': time_spent, 'started': day.strftime('%d/%m/%Y'), 'pat_env': pat_env}
+            if day not in keys:
+                yield row
+            for key in sorted(keys.get(day, ())):
+                yield dict(row, issue=key)
+
+
+def to_started(value, start_time):
+    """JIRA start timestamp for a plan's `started` value (now when empty), or None if it doesn't parse."""
+    value = (value or '').strip()
+    if not value:
+        return datetime.datetime.now().strftime(STARTED_FORMAT)
+    for fmt in ('%H:%M %d-%m-%Y', '%d/%m/%Y', '%d-%m-%Y', '%Y-%m-%d'):
+        try:
+            moment = datetime.datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+        if '%H' not in fmt:
+            moment = datetime.datetime.combine(moment.date(), start_time)
+        return moment.strftime(STARTED_FORMAT)
+    return value if parse_started(value) else None
+
+
+# === JIRA ===
+class _User:
+    """A PAT owner in the plan; assigned issues and worklogs are fetched once, on first need."""
+
+    def __init__(self, pat_env, worklog_cache):
+        self.pat_env = pat_env
+        self.pat = jiraLogger.PAT if pat_env == DEFAULT_PAT_ENV else os.getenv(pat_env)
+        self.worklog_cache = worklog_cache
+        self.index = None
+        self.key_to_id = {}
+        self.error = None
+
+    def load(self):
+        if self.index is None:
+            try:
+                issues = list(jiraLogger.iter_assigned_tasks(self.pat))
+            except (JiraError, requests.RequestException) as exc:
+                self.error, issues = f"Failed to fetch tasks: {exc}", []
+            self.index = SummaryIndex(issues)
+            self.key_to_id = {issue['key']: issue.get('id') for issue in issues}
+        return self.index
+
+    def _myself(self):
+        try:
+            return get_client().get_myself(self.pat), None
+        except (JiraError, requests.RequestException) as exc:
+            return None, f"Failed to fetch the current user: {exc}"
+
+    def _changes(self, since):
+        try:
+            return get_client().worklog_changes(self.pat, since), None
+        except (JiraError, requests.RequestException) as exc:
+            return None, f"Failed to fetch existing worklogs: {exc}"
+
+    def worklogs(self, since):
+        self.load()
+        return self.worklog_cache.get(self.pat, since, self._myself, self._changes)
+
+
+def plan_entries(rows, users, default_time, start_time):
+    """Validate plan rows and resolve them to one entry per issue to log, matching task lines as needed."""
+    for n, row in enumerate(rows, 1):
+        user = users(row.get('pat_env') or DEFAULT_PAT_ENV)
+        time_spent = row.get('time_spent') or default_time or ''
+        started = to_started(row.get('started'), start_time)
+        entry = {'source': row.get('source') or f'row {n}', 'user': user.pat_env,
+                 'issue_key': row.get('issue', '').upper(), 'task': row.get('task', ''),
+                 'time_spent': format_time_spent(time_spent) if is_valid_time_spent(time_spent) else time_spent,
+                 'started': started, 'status': 'planned', 'message': ''}
+        if not user.pat:
+            entry.update(status='invalid', message=f"No PAT in environment variable {user.pat_env}.")
+        elif not is_valid_time_spent(time_spent):
+            entry.update(status='invalid', message='Invalid time (use e.g. 1h10m, 10m, 2h).')
+        elif started is None:
+            entry.update(status='invalid', message='Invalid start (use HH:MM DD-MM-YYYY or DD/MM/YYYY).')
+        elif not entry['issue_key'] and not entry['task']:
+            entry.update(status='invalid', message='Row names neither an issue nor a task.')
+        if entry['status'] != 'planned' or entry['issue_key']:
+            yield entry
+            continue
+        keys = user.load().match_lines(split_lines(entry['task']), substring_fallback=True)
+        if user.error:
+            yield dict(entry, status='failed', message=user.error)
+        elif not keys:
+            yield dict(entry, status='unmatched', message='No assigned task matches these lines.')
+        for key in sorted(keys):
+            yield dict(entry, issue_key=key)
+
+
+def skip_existing(entries, users):
+    """Mark planned entries already in JIRA, or repeated within the plan, as skipped."""
+    seen = set()
+    by_user = {}
+    for entry in entries:
+        if entry['status'] == 'planned':
+            by_user.setdefault(entry['user'], []).append(entry)
+    for pat_env, planned in by_user.items():
+        user = users(pat_env)
+        worklogs, error = user.worklogs(min(parse_started(e['started']) for e in planned))
+        if error:
+            print(f"warning: {pat_env}: {error}; existing worklogs not checked", file=sys.stderr)
+        for entry in planned:
+            identity = (pat_env, entry['issue_key'], entry['started'])
+            issue_id = user.key_to_id.get(entry['issue_key'])
+            if identity in seen:
+                entry.update(status='skipped', message='Repeats an earlier row of the plan.')
+            elif worklogs is not None and issue_id and worklogs.is_logged(issue_id, entry['started']):
+                entry.update(status='skipped', message='Already logged in JIRA at this time.')
+            seen.add(identity)
+
+
+def submit(entries, users, workers):
+    """Post every planned entry concurrently, reporting progress on stderr."""
+    planned = [e for e in entries if e['status'] == 'planned']
+    client = get_client()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(client.post_worklog, users(e['user']).pat, e['issue_key'], e['time_spent'], e['started']): e
+                   for e in planned}
+        for done, future in enumerate(as_completed(futures), 1):
+            entry = futures[future]
+            result = future.result()
+            # 'unknown': the post may have reached JIRA (e.g. a read timeout); check before rerunning
+            status = 'logged' if result['ok'] else 'unknown' if result['uncertain'] else 'failed'
+            entry.update(status=status, message=result['message'], attempts=result['attempts'])
+            print(f"[{done}/{len(planned)}] {entry['issue_key']} {entry['status']}: {entry['message']}", file=sys.stderr)
+
+
+# === CLI ===
+def parse_args(argv):
+    # Shared by both subcommands, so the flags go after the subcommand as in the usage above
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--dry-run', action='store_true', help='resolve and check the plan without logging anything')
+    common.add_argument('--report', help="write a JSON report to this file ('-' for stdout)")
+    common.add_argument('--workers', type=int, default=WORKLOG_MAX_WORKERS, help='worklogs posted at once')
+    common.add_argument('--start-time', default='09:00', help='HH:MM used for rows that only give a date')
+    common.add_argument('--allow-duplicates', action='store_true', help='log rows even if JIRA already has them')
+    common.add_argument('--strict', action='store_true', help='log nothing if any row is invalid or unmatched')
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+    plan = commands.add_parser('plan', parents=[common], help='log the rows of a CSV/JSON/xlsx plan')
+    plan.add_argument('path')
+    plan.add_argument('--format', choices=['csv', 'json', 'jsonl', 'xlsx'], help='default: from the file extension')
+    plan.add_argument('--time', help='time spent for rows that leave it empty')
+    tracker = commands.add_parser('tracker', parents=[common], help="log people's tracker cells over a date range")
+    tracker.add_argument('--name', action='append', required=True, help='tracker column, as NAME or NAME=PAT_ENV')
+    tracker.add_argument('--start', required=True, help='first day, DD/MM/YYYY')
+    tracker.add_argument('--end', required=True, help='last day, DD/MM/YYYY')
+    tracker.add_argument('--time', required=True, help='time spent logged per matched task')
+    tracker.add_argument('--file', default='BSP-G2_Daily_Tracker.xlsx')
+    tracker.add_argument('--sheet', default='Daily')
+    return parser.parse_args(argv)
+
+
+def write_report(path, entries, dry_run, exit_code):
+    counts = {}
+    for entry in entries:
+        counts[entry['status']] = counts.get(entry['status'], 0) + 1
+    print(', '.join(f'{count} {status}' for status, count in sorted(counts.items())) or 'nothing to log', file=sys.stderr)
+    if not path:
+        return
+    report = {'generated': datetime.datetime.now().isoformat(timespec='seconds'), 'dry_run': dry_run,
+              'exit_code': exit_code, 'counts': counts, 'entries': entries}
+    if path == '-':
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        start_time = datetime.datetime.strptime(args.start_time, '%H:%M').time()
+        users = {}
+        worklog_cache = WorklogCache()
+
+        def user(pat_env):
+            if pat_env not in users:
+                users[pat_env] = _User(pat_env, worklog_cache)
+            return users[pat_env]
+
+        if args.command == 'plan':
+            rows = read_plan(args.path, args.format)
+        else:
+            rows = tracker_rows(args.name, args.start, args.end, args.time, args.file, args.sheet, user)
+        entries = list(plan_entries(rows, user, args.time, start_time))
+    except (BatchError, OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return EXIT_USAGE
+
+    incomplete = any(e['status'] in ('invalid', 'unmatched') for e in entries)
+    if not args.allow_duplicates:
+        skip_existing(entries, user)
+    if not args.dry_run and not (args.strict and incomplete):
+        submit(entries, user, args.workers)
+    if any(e['status'] in ('failed', 'unknown') for e in entries):
+        exit_code = EXIT_FAILED
+    elif incomplete:
+        exit_code = EXIT_INCOMPLETE
+    else:
+        exit_code = EXIT_OK
+    write_report(args.report, entries, args.dry_run, exit_code)
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
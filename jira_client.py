@@ -0,0 +1,385 @@
+from concurrent.futures import ThreadPoolExecutor
+from http.cookiejar import DefaultCookiePolicy
+import asyncio
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+import metrics
+from jira_throttle import get_throttle, is_congestion, retry_after_seconds
+
+try:
+    import httpx
+except ImportError:  # optional: only the AsyncJiraClient needs it
+    httpx = None
+
+# === CONFIG ===
+JIRA_DOMAIN = os.getenv('JIRA_DOMAIN', 'https://jira.critical.pt')
+JIRA_POOL_SIZE = int(os.getenv('JIRA_POOL_SIZE', '16'))  # keep-alive connections kept per host
+JIRA_CONNECT_TIMEOUT = float(os.getenv('JIRA_CONNECT_TIMEOUT', '5'))  # seconds
+JIRA_READ_TIMEOUT = float(os.getenv('JIRA_READ_TIMEOUT', '30'))  # seconds
+SEARCH_PAGE_SIZE = int(os.getenv('JIRA_SEARCH_PAGE_SIZE', '100'))
+SEARCH_MAX_WORKERS = int(os.getenv('JIRA_SEARCH_MAX_WORKERS', '4'))
+ISSUE_FIELDS = 'summary,updated'  # The UI shows key (always returned) and summary; updated orders the issue store
+WORKLOG_MAX_WORKERS = int(os.getenv('JIRA_WORKLOG_MAX_WORKERS', '8'))  # default --workers of jira_batch
+WORKLOG_TIMEOUT = float(os.getenv('JIRA_WORKLOG_TIMEOUT', '15'))  # read timeout per attempt
+WORKLOG_RETRIES = int(os.getenv('JIRA_WORKLOG_RETRIES', '3'))  # extra attempts on 429/5xx/connection errors
+WORKLOG_BACKOFF = float(os.getenv('JIRA_WORKLOG_BACKOFF', '0.5'))  # seconds, doubled on each retry
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+WORKLOG_LIST_CHUNK = 1000  # ids per /worklog/list call, the most JIRA accepts
+# What the clients raise when JIRA could not be reached or did not answer in time
+TRANSPORT_ERRORS = (requests.RequestException,) + ((httpx.HTTPError,) if httpx is not None else ())
+
+
+class JiraError(Exception):
+    """Raised when JIRA answers with an unexpected status code."""
+
+    def __init__(self, status_code, text):
+        super().__init__(f"{status_code} {text}")
+        self.status_code = status_code
+        self.text = text
+
+
+def _retry_delay(response, attempt, backoff):
+    """Seconds to wait before the next attempt, preferring the server's Retry-After."""
+    retry_after = retry_after_seconds(response.headers) if response is not None else None
+    if retry_after is not None:
+        return retry_after
+    return backoff * (2 ** attempt)
+
+
+def _release_throttle(throttle, path, start, response):
+    """Hand a call's outcome back to the throttle; `response` is None when the call failed."""
+    status = response.status_code if response is not None else None
+    retry_after = retry_after_seconds(response.headers) if status is not None and is_congestion(status) else None
+    throttle.release(time.perf_counter() - start, status, retry_after, metrics.endpoint_label(path))
+
+
+def _never_sent(exc):
+    """
+    True when a requests error means no connection was made, so a POST cannot have reached
+    JIRA. requests raises ConnectionError for dropped connections too, which may follow a
+    request JIRA already took.
+    """
+    if isinstance(exc, requests.ConnectTimeout):
+        return True
+    reason = getattr(exc.args[0], 'reason', None) if exc.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+def _worklog_payload(time_spent, started):
+    return {
+        "started": started,
+        "timeSpent": time_spent
+    }
+
+
+def _worklog_result(issue_key, time_spent, started):
+    return {'issue_key': issue_key, 'time_spent': time_spent, 'started': started,
+            'ok': False, 'uncertain': False, 'status_code': None, 'message': '', 'attempts': 0}
+
+
+def _record_worklog_response(result, status_code, text):
+    """Fill `result` from a worklog response; returns True when no retry should follow."""
+    result['status_code'] = status_code
+    if status_code == 201:
+        result['ok'] = True
+        result['message'] = f"Successfully logged {result['time_spent']} on {result['issue_key']}"
+        return True
+    result['message'] = f"Failed to log work: {status_code} {text}"
+    return status_code not in RETRY_STATUS_CODES
+
+
+def _json_or_raise(response):
+    if response.status_code != 200:
+        raise JiraError(response.status_code, response.text)
+    return response.json()
+
+
+def _id_chunks(ids):
+    ids = list(ids)
+    return [ids[i:i + WORKLOG_LIST_CHUNK] for i in range(0, len(ids), WORKLOG_LIST_CHUNK)]
+
+
+class JiraClient:
+    """
+    JIRA REST client holding one pooled keep-alive requests.Session.
+
+    A single instance is shared by every user of the process, so the PAT is passed per
+    call and cookies are never stored: JIRA's session cookie must not leak between users.
+    """
+
+    def __init__(self, domain=JIRA_DOMAIN, pool_size=JIRA_POOL_SIZE,
+                 connect_timeout=JIRA_CONNECT_TIMEOUT, read_timeout=JIRA_READ_TIMEOUT, throttle=None):
+        self.domain = domain.rstrip('/')
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.throttle = throttle or get_throttle()
+        self.session = requests.Session()
+        self.session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'Accept': 'application/json',
+            'Accept-Encoding': 'gzip, deflate',
+            'Content-Type': 'application/json',
+        })
+
+    def auth_headers(self, pat):
+        """Return the Authorization header for a PAT; built per call so no token outlives its request."""
+        return {'Authorization': f'Bearer {pat}' if pat else ''}
+
+    def request(self, method, path, pat, timeout=None, **kwargs):
+        """Send a request to `path` on the JIRA domain over the pooled session, once the throttle allows."""
+        read_timeout = self.read_timeout if timeout is None else timeout
+        self.throttle.acquire()
+        response = None
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, f'{self.domain}{path}', headers=self.auth_headers(pat),
+                                            timeout=(self.connect_timeout, read_timeout), **kwargs)
+        except requests.RequestException as exc:
+            metrics.observe_jira(method, path, type(exc).__name__, time.perf_counter() - start, None)
+            raise
+        finally:
+            _release_throttle(self.throttle, path, start, response)
+        metrics.observe_jira(method, path, response.status_code, time.perf_counter() - start, len(response.content))
+        return response
+
+    def search_page(self, pat, jql, start_at=0, max_results=SEARCH_PAGE_SIZE, fields=ISSUE_FIELDS):
+        """Fetch a single page of a JQL search and return the decoded JSON body."""
+        params = {'jql': jql, 'startAt': start_at, 'maxResults': max_results, 'fields': fields}
+        response = self.request('GET', '/rest/api/2/search', pat, params=params)
+        if response.status_code != 200:
+            raise JiraError(response.status_code, response.text)
+        return response.json()
+
+    def iter_issues(self, pat, jql, fields=ISSUE_FIELDS, page_size=SEARCH_PAGE_SIZE, max_workers=SEARCH_MAX_WORKERS):
+        """
+        Yield every issue matching `jql`, following startAt/total across pages.
+
+        The first page is fetched alone to learn `total` and the page size JIRA actually
+        honours (it may cap maxResults); the remaining pages are then fetched concurrently
+        and yielded in order. Only the issues are kept, so no page body outlives its loop.
+        """
+        first = self.search_page(pat, jql, 0, page_size, fields)
+        issues = first.get('issues', [])
+        yield from issues
+        total = first.get('total', len(issues))
+        stride = first.get('maxResults') or len(issues)
+        if not stride or stride >= total:
+            return
+        starts = range(stride, total, stride)
+        pool = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(starts))))
+        try:
+            futures = [pool.submit(self.search_page, pat, jql, start, stride, fields) for start in starts]
+            for future in futures:
+                yield from future.result().get('issues', [])
+        finally:
+            # Consumers may stop early; don't wait on pages nobody will read
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def get_myself(self, pat):
+        """Return the PAT owner's user record (/myself)."""
+        return _json_or_raise(self.request('GET', '/rest/api/2/myself', pat))
+
+    def worklog_ids(self, pat, kind, since):
+        """
+        Return (ids, until) of worklogs `kind` ('updated' or 'deleted') since the epoch-ms `since`,
+        following the lastPage chain; `until` is where the next incremental fetch should start.
+        """
+        ids = []
+        while True:
+            body = _json_or_raise(self.request('GET', f'/rest/api/2/worklog/{kind}', pat, params={'since': since}))
+            ids.extend(value['worklogId'] for value in body.get('values', []))
+            until = body.get('until', since)
+            if body.get('lastPage', True) or until == since:
+                return ids, until
+            since = until
+
+    def worklog_list(self, pat, ids, max_workers=SEARCH_MAX_WORKERS):
+        """Return the full worklogs for `ids`, fetched in chunks concurrently."""
+        chunks = _id_chunks(ids)
+        if not chunks:
+            return []
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as pool:
+            futures = [pool.submit(self.request, 'POST', '/rest/api/2/worklog/list', pat, json={'ids': chunk})
+                       for chunk in chunks]
+            return [worklog for future in futures for worklog in _json_or_raise(future.result())]
+
+    def worklog_changes(self, pat, since):
+        """Return (worklogs, deleted_ids, until) for every worklog changed since the epoch-ms `since`."""
+        updated, until = self.worklog_ids(pat, 'updated', since)
+        deleted, deleted_until = self.worklog_ids(pat, 'deleted', since)
+        return self.worklog_list(pat, updated), deleted, min(until, deleted_until)
+
+    def post_worklog(self, pat, issue_key, time_spent, started,
+                     timeout=WORKLOG_TIMEOUT, retries=WORKLOG_RETRIES, backoff=WORKLOG_BACKOFF):
+        """
+        Post a single worklog, retrying with exponential backoff on 429, 5xx and failed connects.
+        Read timeouts and connections dropped after sending are not retried: the worklog may
+        already have been written, so the result is flagged `uncertain` instead.
+        Returns a result dict: issue_key, time_spent, started, ok, uncertain, status_code, message, attempts.
+        """
+        worklog_path = f'/rest/api/2/issue/{issue_key}/worklog'
+        worklog_payload = _worklog_payload(time_spent, started)
+        result = _worklog_result(issue_key, time_spent, started)
+        for attempt in range(retries + 1):
+            result['attempts'] = attempt + 1
+            response = None
+            try:
+                response = self.request('POST', worklog_path, pat, timeout=timeout, json=worklog_payload)
+            except requests.RequestException as exc:
+                result['message'] = f"Failed to log work: {exc}"
+                if not _never_sent(exc):
+                    result['uncertain'] = True
+                    return result
+            else:
+                if _record_worklog_response(result, response.status_code, response.text):
+                    return result
+            if attempt < retries:
+                time.sleep(_retry_delay(response, attempt, backoff))
+        return result
+
+
+class AsyncJiraClient:
+    """
+    asyncio counterpart of JiraClient on a pooled httpx.AsyncClient, with the same retry
+    and result semantics. Pages and worklogs are overlapped on the event loop instead of
+    a thread per call. Like any httpx.AsyncClient it must stay on the loop it was first used on.
+    """
+
+    def __init__(self, domain=JIRA_DOMAIN, pool_size=JIRA_POOL_SIZE,
+                 connect_timeout=JIRA_CONNECT_TIMEOUT, read_timeout=JIRA_READ_TIMEOUT, throttle=None):
+        if httpx is None:
+            raise RuntimeError('AsyncJiraClient requires httpx (pip install httpx)')
+        self.domain = domain.rstrip('/')
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.throttle = throttle or get_throttle()
+        self.client = httpx.AsyncClient(
+            base_url=self.domain,
+            headers={'Accept': 'application/json', 'Content-Type': 'application/json'},
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+        )
+        self.client.cookies.jar.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+    def auth_headers(self, pat):
+        """Return the Authorization header for a PAT; built per call so no token outlives its request."""
+        return {'Authorization': f'Bearer {pat}' if pat else ''}
+
+    async def request(self, method, path, pat, timeout=None, **kwargs):
+        """Send a request to `path` on the JIRA domain over the pooled client, once the throttle allows."""
+        read_timeout = self.read_timeout if timeout is None else timeout
+        await self.throttle.acquire_async()
+        response = None
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, path, headers=self.auth_headers(pat),
+                                                 timeout=httpx.Timeout(read_timeout, connect=self.connect_timeout), **kwargs)
+        except httpx.HTTPError as exc:
+            metrics.observe_jira(method, path, type(exc).__name__, time.perf_counter() - start, None)
+            raise
+        finally:
+            _release_throttle(self.throttle, path, start, response)
+        metrics.observe_jira(method, path, response.status_code, time.perf_counter() - start, len(response.content))
+        return response
+
+    async def search_page(self, pat, jql, start_at=0, max_results=SEARCH_PAGE_SIZE, fields=ISSUE_FIELDS):
+        """Fetch a single page of a JQL search and return the decoded JSON body."""
+        params = {'jql': jql, 'startAt': start_at, 'maxResults': max_results, 'fields': fields}
+        response = await self.request('GET', '/rest/api/2/search', pat, params=params)
+        if response.status_code != 200:
+            raise JiraError(response.status_code, response.text)
+        return response.json()
+
+    async def search_all(self, pat, jql, fields=ISSUE_FIELDS, page_size=SEARCH_PAGE_SIZE, max_concurrency=SEARCH_MAX_WORKERS):
+        """Return every issue matching `jql`; pages after the first are fetched concurrently."""
+        first = await self.search_page(pat, jql, 0, page_size, fields)
+        issues = list(first.get('issues', []))
+        total = first.get('total', len(issues))
+        stride = first.get('maxResults') or len(issues)
+        if not stride or stride >= total:
+            return issues
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def page(start):
+            async with semaphore:
+                return await self.search_page(pat, jql, start, stride, fields)
+
+        for body in await asyncio.gather(*(page(start) for start in range(stride, total, stride))):
+            issues.extend(body.get('issues', []))
+        return issues
+
+    async def get_myself(self, pat):
+        """Return the PAT owner's user record (/myself)."""
+        return _json_or_raise(await self.request('GET', '/rest/api/2/myself', pat))
+
+    async def worklog_ids(self, pat, kind, since):
+        """Async JiraClient.worklog_ids."""
+        ids = []
+        while True:
+            body = _json_or_raise(await self.request('GET', f'/rest/api/2/worklog/{kind}', pat, params={'since': since}))
+            ids.extend(value['worklogId'] for value in body.get('values', []))
+            until = body.get('until', since)
+            if body.get('lastPage', True) or until == since:
+                return ids, until
+            since = until
+
+    async def worklog_list(self, pat, ids):
+        """Return the full worklogs for `ids`; chunks are fetched concurrently."""
+        bodies = await asyncio.gather(*(self.request('POST', '/rest/api/2/worklog/list', pat, json={'ids': chunk})
+                                        for chunk in _id_chunks(ids)))
+        return [worklog for response in bodies for worklog in _json_or_raise(response)]
+
+    async def worklog_changes(self, pat, since):
+        """Async JiraClient.worklog_changes; the updated and deleted feeds are read concurrently."""
+        (updated, until), (deleted, deleted_until) = await asyncio.gather(
+            self.worklog_ids(pat, 'updated', since), self.worklog_ids(pat, 'deleted', since))
+        return await self.worklog_list(pat, updated), deleted, min(until, deleted_until)
+
+    async def post_worklog(self, pat, issue_key, time_spent, started,
+                           timeout=WORKLOG_TIMEOUT, retries=WORKLOG_RETRIES, backoff=WORKLOG_BACKOFF):
+        """Async JiraClient.post_worklog: same retries, same result dict."""
+        worklog_path = f'/rest/api/2/issue/{issue_key}/worklog'
+        worklog_payload = _worklog_payload(time_spent, started)
+        result = _worklog_result(issue_key, time_spent, started)
+        for attempt in range(retries + 1):
+            result['attempts'] = attempt + 1
+            response = None
+            try:
+                response = await self.request('POST', worklog_path, pat, timeout=timeout, json=worklog_payload)
+            except (httpx.ConnectError, httpx.ConnectTimeout) as exc:
+                result['message'] = f"Failed to log work: {exc!r}"
+            except httpx.HTTPError as exc:
+                result.update(uncertain=True, message=f"Failed to log work: {exc!r}")
+                return result
+            else:
+                if _record_worklog_response(result, response.status_code, response.text):
+                    return result
+            if attempt < retries:
+                await asyncio.sleep(_retry_delay(response, attempt, backoff))
+        return result
+
+    async def aclose(self):
+        await self.client.aclose()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Return the process-wide JiraClient, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = JiraClient()
+    return _client
@@ -0,0 +1,177 @@
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+
+import metrics
+
+# === CONFIG ===
+JIRA_RATE_LIMIT = float(os.getenv('JIRA_RATE_LIMIT', '0'))  # optional hard cap in requests per second; 0 (default) leaves it to the AIMD limit
+JIRA_RATE_BURST = float(os.getenv('JIRA_RATE_BURST', '10'))  # requests allowed back to back after an idle spell
+JIRA_MIN_CONCURRENCY = int(os.getenv('JIRA_MIN_CONCURRENCY', '1'))
+JIRA_MAX_CONCURRENCY = int(os.getenv('JIRA_MAX_CONCURRENCY', '16'))
+JIRA_INITIAL_CONCURRENCY = int(os.getenv('JIRA_INITIAL_CONCURRENCY', '8'))
+JIRA_LATENCY_TOLERANCE = float(os.getenv('JIRA_LATENCY_TOLERANCE', '2.0'))  # x baseline latency read as congestion
+MAX_RETRY_AFTER = 60.0  # never let one Retry-After header stall every user for longer than this
+DECREASE_FACTOR = 0.5
+LATENCY_EWMA_ALPHA = 0.2
+BASELINE_DRIFT = 1.001  # per sample, so the baseline follows a lasting shift in server latency
+
+
+def retry_after_seconds(headers):
+    """Seconds asked for by a Retry-After header (delta-seconds form), or None."""
+    value = headers.get('Retry-After') if headers is not None else None
+    if not value:
+        return None
+    try:
+        return min(MAX_RETRY_AFTER, max(0.0, float(value)))
+    except ValueError:
+        return None
+
+
+def is_congestion(status):
+    """True for outcomes that mean JIRA is overloaded: 429, 5xx, or no response at all (status None)."""
+    return status is None or status == 429 or status >= 500
+
+
+class AdaptiveThrottle:
+    """
+    Process-wide gate in front of every JIRA call: an AIMD limit caps how many calls are
+    in flight at once, and an optional token bucket (off unless JIRA_RATE_LIMIT is set)
+    caps the request rate.
+
+    The in-flight limit grows by one per round trip of healthy responses and is halved,
+    at most once per round trip, on a 429, a 5xx, a failed connection or an endpoint's
+    latency drifting well above the best seen for it. A Retry-After header pauses the
+    bucket for everyone, so the other users stop hammering the server too. Both the
+    thread-based JiraClient and the asyncio AsyncJiraClient share one instance, hence the
+    thread lock and the loop-aware async waiters.
+    """
+
+    def __init__(self, rate=JIRA_RATE_LIMIT, burst=JIRA_RATE_BURST, initial=JIRA_INITIAL_CONCURRENCY,
+                 min_limit=JIRA_MIN_CONCURRENCY, max_limit=JIRA_MAX_CONCURRENCY,
+                 latency_tolerance=JIRA_LATENCY_TOLERANCE):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(self.max_limit, max(self.min_limit, initial)))
+        self.latency_tolerance = latency_tolerance
+        self.in_flight = 0
+        self._tokens = self.burst
+        self._refilled = time.monotonic()
+        self._paused_until = 0.0
+        self._latency = {}  # endpoint -> [smoothed latency, baseline]; endpoints differ too much to share one
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._async_waiters = deque()
+        metrics.jira_concurrency_limit.set(self.limit)
+
+    def _take_token(self, now):
+        """Take a token; returns 0 on success, else the seconds until one is available."""
+        if now < self._paused_until:
+            return self._paused_until - now
+        if self.rate <= 0:
+            return 0
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled) * self.rate)
+        self._refilled = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0
+        return (1 - self._tokens) / self.rate
+
+    def _try_acquire(self):
+        """Returns 0 when a slot was taken, seconds to wait for a token, or None to wait for a release."""
+        if self.in_flight >= int(self.limit):
+            return None
+        wait = self._take_token(time.monotonic())
+        if not wait:
+            self.in_flight += 1
+        return wait
+
+    def acquire(self):
+        """Block the calling thread until a request may be sent."""
+        with self._cond:
+            while True:
+                wait = self._try_acquire()
+                if wait == 0:
+                    return
+                self._cond.wait(wait)
+
+    async def acquire_async(self):
+        """Wait on the running loop, without blocking it, until a request may be sent."""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                wait = self._try_acquire()
+                if wait == 0:
+                    return
+                if wait is None:
+                    future = loop.create_future()
+                    self._async_waiters.append((loop, future))
+            if wait is None:
+                await future
+            else:
+                await asyncio.sleep(wait)
+
+    def release(self, latency, status, retry_after=None, endpoint=''):
+        """
+        Return the slot taken by acquire() and feed the outcome to the limiter: `status` is
+        the HTTP status code, or None when no response came back.
+        """
+        with self._cond:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if retry_after:
+                self._paused_until = max(self._paused_until, now + retry_after)
+                self._tokens = 0.0
+            self._adjust(now, latency, status, endpoint)
+            free = max(1, int(self.limit) - self.in_flight)
+            self._cond.notify(free)
+            while free and self._async_waiters:
+                loop, future = self._async_waiters.popleft()
+                if not future.done():
+                    loop.call_soon_threadsafe(_wake, future)
+                    free -= 1
+
+    def _adjust(self, now, latency, status, endpoint):
+        congested = is_congestion(status)
+        stats = self._latency.get(endpoint)
+        if congested:
+            metrics.jira_throttled_total.inc(status=str(status) if status is not None else 'error')
+        elif latency is not None:
+            if stats is None:
+                stats = self._latency[endpoint] = [latency, latency]
+            else:
+                stats[0] += LATENCY_EWMA_ALPHA * (latency - stats[0])
+                stats[1] = min(latency, stats[1] * BASELINE_DRIFT)
+            congested = stats[0] > stats[1] * self.latency_tolerance
+        if congested:
+            # One cut per round trip: the responses already in flight reflect the old limit
+            if now - self._last_decrease >= (stats[0] if stats else 1.0):
+                self.limit = max(float(self.min_limit), self.limit * DECREASE_FACTOR)
+                self._last_decrease = now
+        else:
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+        metrics.jira_concurrency_limit.set(self.limit)
+
+
+def _wake(future):
+    if not future.done():
+        future.set_result(None)
+
+
+_throttle = None
+_throttle_lock = threading.Lock()
+
+
+def get_throttle():
+    """Return the process-wide AdaptiveThrottle shared by the sync and async JIRA clients."""
+    global _throttle
+    if _throttle is None:
+        with _throttle_lock:
+            if _throttle is None:
+                _throttle = AdaptiveThrottle()
+    return _throttle
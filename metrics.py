@@ -0,0 +1,157 @@
+import bisect
+import functools
+import re
+import threading
+import time
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+_ISSUE_KEY_RE = re.compile(r'/issue/[^/]+')
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _label_key(labels):
+    # Values are kept as text: a status may be 200 or 'ConnectTimeout', and mixed types cannot be sorted
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _label_str(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in labels) + '}'
+
+
+class Counter:
+    """Monotonic counter with labels."""
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{_label_str(key)} {value}')
+        return lines
+
+
+class Gauge:
+    """Value that can go up and down, with labels."""
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def set(self, value, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} gauge']
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{_label_str(key)} {value}')
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels, rendered in the Prometheus text format."""
+
+    def __init__(self, name, help_text, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0, 0.0]
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += 1
+            series[2] += value
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for key, (counts, count, total) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    lines.append(f'{self.name}_bucket{_label_str(key + (("le", repr(float(bound))),))} {cumulative}')
+                lines.append(f'{self.name}_bucket{_label_str(key + (("le", "+Inf"),))} {count}')
+                lines.append(f'{self.name}_sum{_label_str(key)} {total}')
+                lines.append(f'{self.name}_count{_label_str(key)} {count}')
+        return lines
+
+
+jira_request_seconds = Histogram('jira_request_duration_seconds', 'Latency of HTTP calls to JIRA.')
+jira_requests_total = Counter('jira_requests_total', 'HTTP calls to JIRA by endpoint and status code.')
+jira_response_bytes = Histogram('jira_response_bytes', 'Size of JIRA response bodies.', SIZE_BUCKETS)
+call_seconds = Histogram('app_call_duration_seconds', 'Latency of instrumented hot-path functions.')
+call_errors_total = Counter('app_call_errors_total', 'Exceptions raised by instrumented hot-path functions.')
+http_request_seconds = Histogram('app_http_request_duration_seconds', 'Latency of requests served by the web app.')
+jira_concurrency_limit = Gauge('jira_concurrency_limit', 'Adaptive cap on concurrent calls to JIRA.')
+jira_throttled_total = Counter('jira_throttled_total', 'JIRA responses read as overload (429, 5xx, no response).')
+
+REGISTRY = [jira_request_seconds, jira_requests_total, jira_response_bytes,
+            call_seconds, call_errors_total, http_request_seconds, jira_concurrency_limit, jira_throttled_total]
+
+
+def endpoint_label(path):
+    """Collapse per-issue paths so each JIRA endpoint is one series, e.g. /rest/api/2/issue/{key}/worklog."""
+    return _ISSUE_KEY_RE.sub('/issue/{key}', path.split('?', 1)[0])
+
+
+def observe_jira(method, path, status, seconds, size):
+    """Record one HTTP call to JIRA; status is the code, or the exception name when none came back."""
+    endpoint = endpoint_label(path)
+    jira_request_seconds.observe(seconds, method=method, endpoint=endpoint)
+    jira_requests_total.inc(method=method, endpoint=endpoint, status=status)
+    if size is not None:
+        jira_response_bytes.observe(size, method=method, endpoint=endpoint)
+
+
+def timed(name):
+    """Decorator recording the latency (and exceptions) of a hot-path function under `name`."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                call_errors_total.inc(function=name)
+                raise
+            finally:
+                call_seconds.observe(time.perf_counter() - start, function=name)
+        return wrapper
+    return decorator
+
+
+def render():
+    """All metrics in the Prometheus text exposition format."""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,192 @@
+import hashlib
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# === CONFIG ===
+TASK_CACHE_TTL = float(os.getenv('TASK_CACHE_TTL', '300'))  # seconds a user's task list is served without asking JIRA
+TASK_CACHE_FULL_REFRESH = float(os.getenv('TASK_CACHE_FULL_REFRESH', '1800'))  # seconds between full re-syncs
+TASK_CACHE_MAX_USERS = int(os.getenv('TASK_CACHE_MAX_USERS', '64'))  # LRU bound across PATs
+TASK_CACHE_REFRESH_WORKERS = int(os.getenv('TASK_CACHE_REFRESH_WORKERS', '2'))  # background syncs when a store is used
+
+ASSIGNED_JQL = 'assignee = currentUser() ORDER BY updated DESC'
+UPDATED_SINCE_JQL = 'assignee = currentUser() AND updated >= -{minutes}m ORDER BY updated DESC'
+
+
+def pat_fingerprint(pat):
+    """Return a stable, non-reversible key for a PAT so raw tokens are never used as dict keys."""
+    return hashlib.sha256((pat or '').encode('utf-8')).hexdigest()
+
+
+class _Entry:
+    """Cached issues of a single user, ordered by most recently updated first."""
+
+    def __init__(self):
+        self.issues = OrderedDict()
+        self.synced_at = 0.0
+        self.full_synced_at = 0.0
+        self.stale = True
+        self.version = 0
+        self.derived = {}
+        self.loaded = False  # seeded from the store
+        self.refreshing = False
+
+
+class TaskCache:
+    """
+    Per-PAT cache of assigned JIRA issues.
+
+    Entries are served without any JIRA call while younger than `ttl`. Once expired
+    (or invalidated after logging work) only issues with `updated` since the last sync
+    are fetched and merged in. A full search is still done every `full_refresh` seconds
+    so issues that were unassigned meanwhile drop out. At most `max_users` PATs are
+    kept, evicting the least recently used.
+
+    With an IssueStore, a user's first read after a start is served from disk, and an
+    expired list is served as is while the sync runs in the background; every sync is
+    written back. Only a user the store has never seen waits for JIRA.
+    """
+
+    def __init__(self, ttl=TASK_CACHE_TTL, full_refresh=TASK_CACHE_FULL_REFRESH, max_users=TASK_CACHE_MAX_USERS,
+                 store=None):
+        self.ttl = ttl
+        self.full_refresh = full_refresh
+        self.max_users = max_users
+        self.store = store
+        self._refresher = ThreadPoolExecutor(max_workers=TASK_CACHE_REFRESH_WORKERS,
+                                             thread_name_prefix='task-refresh') if store else None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, pat, search):
+        """
+        Return (issues, error) for the given PAT.
+        `search(jql)` must return (issues, error) and is only called when the entry is cold or expired;
+        with a store it may run on a background thread, so it must not depend on the request.
+        """
+        user = pat_fingerprint(pat)
+        with self._lock:
+            entry = self._entries.get(user)
+            if entry is None:
+                entry = _Entry()
+                self._entries[user] = entry
+                while len(self._entries) > self.max_users:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(user)
+            seed = self.store is not None and not entry.loaded
+        if seed:
+            self._seed(user, entry)
+
+        now = time.time()
+        with self._lock:
+            if not entry.stale and now - entry.synced_at < self.ttl:
+                return list(entry.issues.values()), None
+            if self.store is not None and entry.issues:
+                # Serve what we have; JIRA is reconciled off the request
+                if not entry.refreshing:
+                    entry.refreshing = True
+                    self._refresher.submit(self._background_sync, user, entry, search)
+                return list(entry.issues.values()), None
+        return self._sync(user, entry, search)
+
+    def _seed(self, user, entry):
+        issues, synced_at, full_synced_at = self.store.load(user)
+        with self._lock:
+            if entry.loaded:
+                return
+            entry.loaded = True
+            if issues and not entry.issues:
+                entry.issues = OrderedDict((issue['key'], issue) for issue in issues)
+                entry.synced_at = synced_at
+                entry.full_synced_at = full_synced_at
+                entry.stale = False
+                entry.version += 1
+
+    def _background_sync(self, user, entry, search):
+        try:
+            self._sync(user, entry, search)
+        except Exception:
+            pass  # the next expired read tries again
+        finally:
+            with self._lock:
+                entry.refreshing = False
+
+    def _sync(self, user, entry, search):
+        """Fetch what changed since the entry's last sync (everything when a full refresh is due) and merge it."""
+        now = time.time()
+        with self._lock:
+            full = not entry.full_synced_at or now - entry.full_synced_at >= self.full_refresh
+            since = entry.synced_at
+
+        if full:
+            issues, error = search(ASSIGNED_JQL)
+        else:
+            # Relative JQL dates avoid guessing the JIRA user's timezone; one extra minute covers clock skew.
+            minutes = int(math.ceil((now - since) / 60.0)) + 1
+            issues, error = search(UPDATED_SINCE_JQL.format(minutes=minutes))
+
+        if not error and self.store is not None:
+            # Written before the new version is visible, so views querying the store never lag it
+            self.store.save(user, issues, now, now if full else entry.full_synced_at, full=full)
+        with self._lock:
+            if error:
+                if entry.issues:
+                    # Serve the last known list rather than failing the page.
+                    return list(entry.issues.values()), None
+                return [], error
+            if full:
+                entry.issues = OrderedDict((issue['key'], issue) for issue in issues)
+                entry.full_synced_at = now
+                entry.version += 1
+            elif issues:
+                for issue in reversed(issues):
+                    entry.issues[issue['key']] = issue
+                    entry.issues.move_to_end(issue['key'], last=False)
+                entry.version += 1
+            entry.synced_at = now
+            entry.stale = False
+            return list(entry.issues.values()), None
+
+    def get_derived(self, pat, search, name, build):
+        """
+        Return (build(issues), error), memoized per user under `name` until their issues change.
+        Used for structures derived from the task list, such as the summary index.
+        """
+        issues, error = self.get(pat, search)
+        user = pat_fingerprint(pat)
+        with self._lock:
+            entry = self._entries.get(user)
+            if entry is not None:
+                # Snapshot issues and version together so the memo can't pair them wrongly
+                version = entry.version
+                issues = list(entry.issues.values()) or issues
+                memo = entry.derived.get(name)
+            else:
+                version = memo = None
+        if memo is not None and memo[0] == version:
+            return memo[1], error
+        value = build(issues)
+        if entry is not None and not error:
+            with self._lock:
+                entry.derived[name] = (version, value)
+        return value, error
+
+    def invalidate(self, pat, full=False):
+        """Mark a user's entry stale so the next read refreshes it (incrementally unless `full`)."""
+        user = pat_fingerprint(pat)
+        with self._lock:
+            entry = self._entries.get(user)
+            if entry is None:
+                return
+            entry.stale = True
+            if full:
+                entry.full_synced_at = 0.0
+
+    def clear(self):
+        """Drop every cached entry."""
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,96 @@
+import base64
+import bisect
+import json
+import os
+import threading
+from collections import OrderedDict
+
+# === CONFIG ===
+INDEX_PAGE_SIZE = int(os.getenv('INDEX_PAGE_SIZE', '50'))
+FILTER_MEMO_SIZE = 32  # filtered views kept per task list
+
+
+def _sort_key(issue, sort_by):
+    if sort_by == 'summary':
+        # Key breaks ties so every row has a unique position and cursors stay unambiguous
+        return issue['fields']['summary'].lower(), issue['key']
+    return issue['key'], ''
+
+
+def encode_cursor(sort_key):
+    return base64.urlsafe_b64encode(json.dumps(sort_key).encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """Return the sort key encoded in a cursor, or None for a missing or malformed one."""
+    if not cursor:
+        return None
+    try:
+        value = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (ValueError, TypeError):
+        return None
+    # Sort keys are (str, str); anything else would fail to compare against them
+    if isinstance(value, list) and len(value) == 2 and all(isinstance(part, str) for part in value):
+        return tuple(value)
+    return None
+
+
+class SortedTasks:
+    """
+    A user's task list presorted by key and by summary, built once per task-list version.
+
+    Filtering scans the presorted rows once per (sort, keyword) and is memoized, and pages
+    are addressed by cursors holding the sort key of the last row shown: the next page
+    starts right after that value, so tasks added or removed meanwhile don't shift rows
+    between pages the way offsets would.
+    """
+
+    def __init__(self, issues, search=None):
+        self.total = len(issues)
+        self.search = search  # optional keyword -> matching keys, e.g. the issue store's full-text index
+        self.sorted = {}
+        for sort_by in ('key', 'summary'):
+            rows = sorted(issues, key=lambda t: _sort_key(t, sort_by))
+            self.sorted[sort_by] = (rows, [_sort_key(t, sort_by) for t in rows])
+        self._filtered = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _view(self, sort_by, keyword):
+        rows, keys = self.sorted[sort_by]
+        if not keyword:
+            return rows, keys
+        memo_key = (sort_by, keyword)
+        with self._lock:
+            view = self._filtered.get(memo_key)
+            if view is not None:
+                self._filtered.move_to_end(memo_key)
+                return view
+        if self.search is not None:
+            found = self.search(keyword)
+            positions = [i for i, t in enumerate(rows) if t['key'] in found]
+        else:
+            positions = [i for i, t in enumerate(rows) if keyword in t['fields']['summary'].lower()]
+        view = ([rows[i] for i in positions], [keys[i] for i in positions])
+        with self._lock:
+            self._filtered[memo_key] = view
+            while len(self._filtered) > FILTER_MEMO_SIZE:
+                self._filtered.popitem(last=False)
+        return view
+
+    def page(self, sort_by='summary', sort_order='desc', keyword='', cursor=None, page_size=INDEX_PAGE_SIZE):
+        """Return (tasks, next_cursor, matching_count) for one page; next_cursor is None on the last page."""
+        if sort_by not in self.sorted:
+            sort_by = 'key'
+        rows, keys = self._view(sort_by, keyword)
+        after = decode_cursor(cursor)
+        if sort_order == 'desc':
+            end = len(rows) if after is None else bisect.bisect_left(keys, after)
+            start = max(0, end - page_size)
+            tasks = rows[start:end][::-1]
+            next_cursor = encode_cursor(keys[start]) if start > 0 else None
+        else:
+            start = 0 if after is None else bisect.bisect_right(keys, after)
+            end = min(len(rows), start + page_size)
+            tasks = rows[start:end]
+            next_cursor = encode_cursor(keys[end - 1]) if end < len(rows) else None
+        return tasks, next_cursor, len(rows)
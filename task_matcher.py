@@ -0,0 +1,115 @@
+import re
+
+import metrics
+
+# === PATTERNS ===
+VERB_RE = re.compile(r'\b(author|review|rework)\b')
+LINE_RE = re.compile(
+    r'\b(?:author|review|rework)[^a-zA-Z0-9]*\d*\s*(tcs?/tps?|tps?/tcs?|tcs?|tps?)?\s*([a-zA-Z0-9_]+)\s*$'
+)
+TOKEN_RE = re.compile(r'[a-z0-9_]+')
+WHITESPACE_RE = re.compile(r'\s+')
+TYPE_RES = {'TC': re.compile(r'\bTC\b'), 'TP': re.compile(r'\bTP\b')}
+
+# Verbs in a task line mapped to the keyword used in JIRA summaries
+SUMMARY_VERBS = {'author': 'Authoring', 'rework': 'Authoring', 'review': 'Review'}
+
+
+def split_lines(text):
+    """Split pasted text or a tracker cell into task lines, dropping bullets and blanks."""
+    lines = (line.strip('-').strip() for line in str(text).splitlines())
+    return [line for line in lines if line]
+
+
+def parse_line(line):
+    """
+    Parse a task line into (summary_verb, types, base).
+    `types` is a tuple drawn from 'TC'/'TP', empty when the line names no type.
+    Returns None when the line has no recognised verb or base.
+    """
+    lowered = line.lower()
+    verb_match = VERB_RE.search(lowered)
+    if not verb_match:
+        return None
+    match = LINE_RE.search(lowered)
+    if not match:
+        return None
+    type_indicator = match.group(1) or ''
+    types = tuple(typ for typ in ('TC', 'TP') if typ.lower() in type_indicator)
+    return SUMMARY_VERBS[verb_match.group(1)], types, match.group(2)
+
+
+class SummaryIndex:
+    """
+    Inverted index over issue summaries: token -> issue keys, plus the keys whose
+    summary carries each summary verb and each TC/TP marker.
+    """
+
+    @metrics.timed('task_matcher.build_index')
+    def __init__(self, issues):
+        self.summaries = {}
+        self.tokens = {}
+        self.verbs = {verb: set() for verb in set(SUMMARY_VERBS.values())}
+        self.types = {typ: set() for typ in TYPE_RES}
+        self._base_cache = {}
+        for issue in issues:
+            key = issue['key']
+            summary = WHITESPACE_RE.sub(' ', issue['fields']['summary'])
+            self.summaries[key] = summary
+            for token in set(TOKEN_RE.findall(summary.lower())):
+                self.tokens.setdefault(token, set()).add(key)
+            for verb, keys in self.verbs.items():
+                if verb in summary:
+                    keys.add(key)
+            for typ, pattern in TYPE_RES.items():
+                if pattern.search(summary):
+                    self.types[typ].add(key)
+
+    def keys_with_base(self, base):
+        """Keys whose summary contains `base` (case-insensitive)."""
+        base = base.lower()
+        found = self._base_cache.get(base)
+        if found is None:
+            # A base is made of word characters only, so it can only occur inside a single token
+            found = set(self.tokens.get(base, ()))
+            for token, keys in self.tokens.items():
+                if base in token and token != base:
+                    found |= keys
+            self._base_cache[base] = found
+        return found
+
+    def match_parsed(self, parsed):
+        """Return the set of issue keys matching a (summary_verb, types, base) tuple from parse_line."""
+        summary_verb, types, base = parsed
+        candidates = self.verbs[summary_verb] & self.keys_with_base(base)
+        if not types:
+            return candidates
+        typed = set()
+        for typ in types:
+            typed |= self.types[typ]
+        return candidates & typed
+
+    def match_line(self, line):
+        """Return the set of issue keys matching a task line."""
+        parsed = parse_line(line)
+        return self.match_parsed(parsed) if parsed else set()
+
+    def match_substring(self, line):
+        """Fallback for lines without a verb: keys whose summary contains the whole line."""
+        lowered = line.lower()
+        return {key for key, summary in self.summaries.items() if lowered in summary.lower()}
+
+    @metrics.timed('task_matcher.match_lines')
+    def match_lines(self, lines, substring_fallback=False):
+        """
+        Match every line and return the union of matched keys.
+        With `substring_fallback`, lines without any verb match summaries containing the whole line.
+        """
+        matched = set()
+        for line in lines:
+            parsed = parse_line(line)
+            if parsed:
+                matched |= self.match_parsed(parsed)
+            elif substring_fallback and not VERB_RE.search(line.lower()):
+                matched |= self.match_substring(line)
+        return matched
@@ -0,0 +1,33 @@
+import re
+
+
+def is_valid_time_spent(val):
+    """Check if the time spent string is valid (e.g. 1h, 10m, 1h10m)."""
+    return bool(re.fullmatch(r'([0-9]+h)?([0-9]+m)?', val.strip())) and val.strip() != ''
+
+
+def parse_time_spent(val):
+    """Parse a time spent string into hours and minutes as integers."""
+    match = re.fullmatch(r'(?:(\d+)h)?(?:(\d+)m)?', val.strip())
+    if not match:
+        return 0, 0
+    hours = int(match.group(1)) if match.group(1) else 0
+    minutes = int(match.group(2)) if match.group(2) else 0
+    return hours, minutes
+
+
+def format_time_spent(val):
+    """Normalize a time spent string for JIRA; if only hours, add 0m for display/logging clarity."""
+    hours, minutes = parse_time_spent(val)
+    formatted_time_spent = ''
+    if hours:
+        formatted_time_spent += f'{hours}h'
+    if minutes or not hours:
+        formatted_time_spent += f'{minutes}m'
+    return formatted_time_spent
+
+
+def format_seconds(seconds):
+    """Format a duration in seconds the way JIRA shows time spent, e.g. 7h30m."""
+    hours, minutes = divmod(int(seconds) // 60, 60)
+    return format_time_spent(f'{hours}h{minutes}m')
@@ -0,0 +1,99 @@
+import os
+
+import pandas as pd
+
+import metrics
+import tracker_sidecar
+import tracker_stream
+import tracker_tasks
+from workbook_cache import workbook_cache
+
+# === CONFIG ===
+EXCEL_ENGINES = ('pandas', 'stream')
+EXCEL_LOOKUP_ENGINE = os.getenv('EXCEL_LOOKUP_ENGINE', 'pandas')  # how get_excel_entry reads a workbook that is not cached
+
+
+@metrics.timed('get_excel_entry')
+def get_excel_entry(date_str, name, file_path='BSP-G2_Daily_Tracker.xlsx', sheet_name='Daily', engine=None):
+    """
+    Returns the cell value for the given name (column) on the given date (DD/MM/YYYY) from the Excel file.
+
+    A sheet already in the workbook cache is always answered from memory. Otherwise `engine`
+    (default EXCEL_LOOKUP_ENGINE) decides: 'pandas' reads the columnar sidecar, converting the
+    sheet once if needed, which pays off over repeated lookups; 'stream' scans the xlsx for this
+    one cell with tracker_stream, in flat memory and keeping nothing, for one-off lookups on
+    huge trackers.
+    """
+    engine = engine or EXCEL_LOOKUP_ENGINE
+    if engine not in EXCEL_ENGINES:
+        raise ValueError(f"Unknown Excel engine '{engine}'; use one of {', '.join(EXCEL_ENGINES)}.")
+    try:
+        date_obj = pd.to_datetime(date_str, format='%d/%m/%Y', dayfirst=True)
+    except Exception:
+        return "Invalid date format. Use DD/MM/YYYY."
+    workbook = workbook_cache.peek(file_path, sheet_name)
+    if workbook is None and engine == 'stream':
+        has_column, found, value = tracker_stream.lookup(file_path, sheet_name, date_obj.date(), name)
+    elif workbook is None:
+        # Cold: read just the Days column and this name's column from the sidecar
+        try:
+            has_column, found, value = tracker_sidecar.lookup(file_path, sheet_name, date_obj.date(), name)
+        except OSError:
+            workbook = workbook_cache.get(file_path, sheet_name)
+    if workbook is not None:
+        has_column = workbook.has_column(name)
+        row = workbook.row_for(date_obj.date()) if has_column else None
+        found = row is not None
+        value = workbook.cell(row, name) if found else None
+    if not has_column:
+        return f"No column named '{name}' in sheet '{sheet_name}'."
+    if not found:
+        return f"No entry found for date {date_str}."
+    return value
+
+
+def build_excel_sidecar(file_path='BSP-G2_Daily_Tracker.xlsx', sheet_name='Daily'):
+    """Convert the tracker sheet to its columnar sidecar ahead of time (it is otherwise built on first lookup)."""
+    return tracker_sidecar.build_sidecar(file_path, sheet_name)
+
+
+@metrics.timed('get_excel_range')
+def get_excel_range(start_str, end_str, name, file_path='BSP-G2_Daily_Tracker.xlsx', sheet_name='Daily'):
+    """
+    Returns ([(date, cell value), ...], error) for the given name (column) over an inclusive
+    DD/MM/YYYY date range, reading the sheet once. Days with an empty cell are skipped.
+    """
+    try:
+        start = pd.to_datetime(start_str, format='%d/%m/%Y', dayfirst=True).date()
+        end = pd.to_datetime(end_str, format='%d/%m/%Y', dayfirst=True).date()
+    except Exception:
+        return [], "Invalid date format. Use DD/MM/YYYY."
+    if end < start:
+        return [], "End date is before start date."
+    workbook = workbook_cache.get(file_path, sheet_name)
+    if not workbook.has_column(name):
+        return [], f"No column named '{name}' in sheet '{sheet_name}'."
+    entries = [(day, value) for day, value in workbook.iter_range(name, start, end)
+               if pd.notna(value) and str(value).strip()]
+    return entries, None
+
+
+@metrics.timed('get_excel_tasks')
+def get_excel_tasks(start_str, end_str=None, names=None, file_path='BSP-G2_Daily_Tracker.xlsx', sheet_name='Daily'):
+    """
+    Returns (tasks, error): the tidy (date, person, line, verb, type, base) frame from
+    tracker_tasks.extract_tasks for the given names (every person column by default) over an
+    inclusive DD/MM/YYYY date range (a single day when end_str is omitted), reading the sheet once.
+    """
+    try:
+        start = pd.to_datetime(start_str, format='%d/%m/%Y', dayfirst=True).date()
+        end = pd.to_datetime(end_str or start_str, format='%d/%m/%Y', dayfirst=True).date()
+    except Exception:
+        return None, "Invalid date format. Use DD/MM/YYYY."
+    if end < start:
+        return None, "End date is before start date."
+    workbook = workbook_cache.get(file_path, sheet_name)
+    missing = [name for name in names or () if not workbook.has_column(name)]
+    if missing:
+        return None, f"No column named '{missing[0]}' in sheet '{sheet_name}'."
+    return tracker_tasks.extract_tasks(workbook.frame(start, end, names)), None
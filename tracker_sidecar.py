@@ -0,0 +1,120 @@
+import os
+import pickle
+import uuid
+
+import numpy as np
+import pandas as pd
+
+# === CONFIG ===
+SIDECAR_DIR = os.getenv('TRACKER_SIDECAR_DIR')  # default: next to the workbook
+DAYS_COLUMN = 'Days'
+
+
+def sidecar_path(file_path, sheet_name):
+    """Directory holding the columnar copy of one sheet of a workbook."""
+    base_dir = SIDECAR_DIR or os.path.dirname(os.path.abspath(file_path))
+    return os.path.join(base_dir, f'.{os.path.basename(file_path)}.{sheet_name}.sidecar')
+
+
+def source_version(file_path):
+    """Version of the workbook on disk, as (mtime_ns, size)."""
+    stat = os.stat(file_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _read_meta(path):
+    try:
+        with open(os.path.join(path, 'meta.pkl'), 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+
+
+def _write_atomic(path, write):
+    tmp = f'{path}.{uuid.uuid4().hex}.tmp'
+    with open(tmp, 'wb') as f:
+        write(f)
+    os.replace(tmp, path)
+
+
+def build_sidecar(file_path, sheet_name='Daily', df=None):
+    """
+    Convert one sheet to the columnar sidecar: the Days column as a memory-mappable
+    datetime64[D] .npy, and every other column as its own pickle, so a lookup only
+    reads the dates plus the one column it needs. Returns the sidecar directory.
+    """
+    version = source_version(file_path)
+    if df is None:
+        df = pd.read_excel(file_path, sheet_name=sheet_name)
+    path = sidecar_path(file_path, sheet_name)
+    os.makedirs(path, exist_ok=True)
+    tag = f'{version[0]}_{version[1]}'
+    days = pd.to_datetime(df[DAYS_COLUMN], errors='coerce').values.astype('datetime64[D]')
+    days_file = f'days.{tag}.npy'
+    _write_atomic(os.path.join(path, days_file), lambda f: np.save(f, days))
+    columns = {}
+    for i, name in enumerate(df.columns):
+        if name == DAYS_COLUMN:
+            continue
+        column_file = f'col{i}.{tag}.pkl'
+        values = df[name].values
+        _write_atomic(os.path.join(path, column_file), lambda f: pickle.dump(values, f, pickle.HIGHEST_PROTOCOL))
+        columns[name] = column_file
+    meta = {'version': version, 'days': days_file, 'columns': columns, 'order': list(df.columns)}
+    # Data files carry the version in their name and meta is swapped in last, so readers never mix versions
+    _write_atomic(os.path.join(path, 'meta.pkl'), lambda f: pickle.dump(meta, f, pickle.HIGHEST_PROTOCOL))
+    keep = {'meta.pkl', days_file, *columns.values()}
+    for name in os.listdir(path):
+        if name not in keep and not name.endswith('.tmp'):
+            try:
+                os.remove(os.path.join(path, name))
+            except OSError:
+                pass
+    return path
+
+
+def ensure_sidecar(file_path, sheet_name='Daily'):
+    """Return (sidecar directory, meta), rebuilding the sidecar if the workbook changed on disk."""
+    path = sidecar_path(file_path, sheet_name)
+    meta = _read_meta(path)
+    if meta is None or meta['version'] != source_version(file_path):
+        build_sidecar(file_path, sheet_name)
+        meta = _read_meta(path)
+    return path, meta
+
+
+def load_column(path, meta, name):
+    """Load a single person column from the sidecar."""
+    with open(os.path.join(path, meta['columns'][name]), 'rb') as f:
+        return pickle.load(f)
+
+
+def load_days(path, meta):
+    """Memory-map the Days column of the sidecar."""
+    return np.load(os.path.join(path, meta['days']), mmap_mode='r')
+
+
+def load_frame(file_path, sheet_name='Daily'):
+    """Rebuild the whole sheet as a DataFrame from the sidecar, much faster than re-parsing the xlsx."""
+    path, meta = ensure_sidecar(file_path, sheet_name)
+    data = {}
+    for name in meta['order']:
+        if name == DAYS_COLUMN:
+            data[name] = np.asarray(load_days(path, meta)).astype('datetime64[ns]')
+        else:
+            data[name] = load_column(path, meta, name)
+    return pd.DataFrame(data, columns=meta['order'])
+
+
+def lookup(file_path, sheet_name, date, name):
+    """
+    Return (has_column, found, value) for a name (column) on a datetime.date,
+    reading only the Days column and the requested column.
+    """
+    path, meta = ensure_sidecar(file_path, sheet_name)
+    if name not in meta['columns']:
+        return False, False, None
+    rows = np.flatnonzero(load_days(path, meta) == np.datetime64(date, 'D'))
+    if not len(rows):
+        return True, False, None
+    return True, True, load_column(path, meta, name)[rows[0]]
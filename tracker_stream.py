@@ -0,0 +1,286 @@
+import datetime
+import posixpath
+import zipfile
+from xml.etree.ElementTree import fromstring
+from xml.parsers import expat
+
+# === CONFIG ===
+DAYS_COLUMN = 'Days'
+DATE_FORMATS = ('%Y-%m-%d', '%Y-%m-%d %H:%M:%S', '%d/%m/%Y')  # Days typed in as text instead of as dates
+READ_CHUNK = 64 * 1024  # bytes of XML parsed between checks for whether we can stop
+
+EXCEL_EPOCHS = {False: datetime.datetime(1899, 12, 30), True: datetime.datetime(1904, 1, 1)}
+REL_ID = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id'
+# Transitional and strict OOXML; expat reports tags as namespace}name, compared as whole
+# strings since the per-element callbacks are where a scan spends its time
+SHEET_NAMESPACES = ('http://schemas.openxmlformats.org/spreadsheetml/2006/main',
+                    'http://purl.oclc.org/ooxml/spreadsheetml/main')
+
+
+def _tags(name):
+    return frozenset(f'{ns}}}{name}' for ns in SHEET_NAMESPACES)
+
+
+ROW_TAGS = _tags('row')
+CELL_TAGS = _tags('c')
+TEXT_TAGS = _tags('v') | _tags('t')
+STRING_TAGS = _tags('si')
+PHONETIC_TAGS = _tags('rPh')
+
+
+def as_date(value):
+    """The datetime.date held by a Days cell, or None for blanks and anything that is not a date."""
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    if isinstance(value, str):
+        for fmt in DATE_FORMATS:
+            try:
+                return datetime.datetime.strptime(value.strip(), fmt).date()
+            except ValueError:
+                continue
+    return None
+
+
+def _column(ref):
+    """0-based column of a cell reference such as 'AB12'."""
+    col = 0
+    for ch in ref:
+        if not ch.isalpha():
+            break
+        col = col * 26 + ord(ch.upper()) - 64
+    return col - 1
+
+
+class _SharedIndex(int):
+    """A cell holding the index of a shared string, resolved once we know which ones are needed."""
+
+
+def _convert(kind, text):
+    """Python value of a cell from its t= attribute and text; None when it is empty."""
+    if text is None:
+        return None
+    if kind == 's':
+        return _SharedIndex(text)
+    if kind == 'b':
+        return text == '1'
+    if kind in ('str', 'e', 'inlineStr'):
+        return text
+    number = float(text)
+    return int(number) if number.is_integer() else number
+
+
+def _parse(stream, handler, stop=lambda: False):
+    """Feed an XML stream to the handler's callbacks in chunks, until it ends or `stop()` is true; yields after each chunk."""
+    parser = expat.ParserCreate(namespace_separator='}')
+    parser.buffer_text = True
+    parser.StartElementHandler = handler.start
+    parser.EndElementHandler = handler.end
+    parser.CharacterDataHandler = handler.data
+    while not stop():
+        chunk = stream.read(READ_CHUNK)
+        parser.Parse(chunk, not chunk)
+        yield
+        if not chunk:
+            return
+
+
+class _TextCollector:
+    """Shared expat state for picking the text out of <v>/<t>, leaving out phonetic hints."""
+
+    def __init__(self):
+        self._parts = None  # text of the current value; None while not collecting
+        self._capture = False
+        self._phonetic = False
+
+    def _text_start(self, name):
+        if name in TEXT_TAGS and not self._phonetic:
+            self._capture = True
+        elif name in PHONETIC_TAGS:
+            self._phonetic = True
+
+    def end(self, name):
+        if name in TEXT_TAGS:
+            self._capture = False
+        elif name in PHONETIC_TAGS:
+            self._phonetic = False
+
+    def data(self, text):
+        if self._capture and self._parts is not None:
+            self._parts.append(text)
+
+
+class _RowReader(_TextCollector):
+    """
+    Turns sheet XML into {column: value} rows, decoding only the cells in `wanted` (every
+    cell while it is None). Nothing else is kept, so memory does not grow with the sheet.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.wanted = None
+        self.rows = []  # finished rows not handed out yet
+        self._row = None
+        self._col = -1
+        self._kind = None  # t= of the cell being decoded; None while skipping a cell
+        self._seen = False  # whether that cell had a value element at all
+
+    def start(self, name, attrs):
+        if name in CELL_TAGS:
+            ref = attrs.get('r')
+            self._col = _column(ref) if ref else self._col + 1
+            wanted = self.wanted is None or self._col in self.wanted
+            self._kind = attrs.get('t', 'n') if wanted else None
+            self._parts = [] if wanted else None
+            self._seen = False
+        elif name in ROW_TAGS:
+            self._row = {}
+            self._col = -1
+        elif self._kind is not None:
+            self._seen = self._seen or name in TEXT_TAGS
+            self._text_start(name)
+
+    def end(self, name):
+        if name in CELL_TAGS:
+            if self._kind is not None:
+                self._row[self._col] = _convert(self._kind, ''.join(self._parts) if self._seen else None)
+                self._kind = self._parts = None
+        elif name in ROW_TAGS:
+            self.rows.append(self._row)
+        else:
+            super().end(name)
+
+    def iter_rows(self, stream):
+        """Yield rows as they are parsed; `wanted` may be narrowed between rows."""
+        for _ in _parse(stream, self):
+            rows, self.rows = self.rows, []
+            yield from rows
+
+
+class _StringReader(_TextCollector):
+    """Collects the shared strings at the `wanted` indexes (all when None)."""
+
+    def __init__(self, wanted=None):
+        super().__init__()
+        self.wanted = wanted
+        self.last = max(wanted) if wanted else None
+        self.found = {}
+        self.done = False
+        self._index = -1
+
+    def start(self, name, attrs):
+        if name in STRING_TAGS:
+            self._index += 1
+            self._parts = [] if self.wanted is None or self._index in self.wanted else None
+        elif self._parts is not None:
+            self._text_start(name)
+
+    def end(self, name):
+        if name in STRING_TAGS and self._parts is not None:
+            self.found[self._index] = ''.join(self._parts)
+            self._parts = None
+            self.done = self._index == self.last
+        else:
+            super().end(name)
+
+
+class _SharedStrings:
+    """The workbook's shared string table, streamed for just the indexes asked for."""
+
+    def __init__(self, archive, path):
+        self.archive = archive
+        self.path = path
+        self._all = None
+
+    def _read(self, wanted):
+        reader = _StringReader(wanted)
+        if self.path is not None:
+            with self.archive.open(self.path) as stream:
+                for _ in _parse(stream, reader, stop=lambda: reader.done):
+                    pass
+        return reader.found
+
+    def get(self, indexes):
+        """Return {index: text} for the given indexes, reading no further than the largest one."""
+        wanted = set(indexes)
+        return self._read(wanted) if wanted else {}
+
+    def all(self):
+        """Every string, for the rare sheet whose Days are shared-string text; loaded once."""
+        if self._all is None:
+            self._all = self._read(None)
+        return self._all
+
+
+def _day(value, strings, epoch):
+    """The datetime.date of a raw Days cell: an Excel serial number, or a date written as text."""
+    if isinstance(value, _SharedIndex):
+        return as_date(strings.all().get(value))
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (epoch + datetime.timedelta(days=value)).date()
+    return as_date(value)
+
+
+def _locate(archive, sheet_name):
+    """Return (sheet part, shared strings part or None, date epoch) for a sheet of the workbook."""
+    workbook = fromstring(archive.read('xl/workbook.xml'))
+    date1904 = False
+    rel_id = None
+    for elem in workbook.iter():
+        tag = elem.tag.rpartition('}')[2]
+        if tag == 'workbookPr':
+            date1904 = elem.get('date1904', '').lower() in ('1', 'true')
+        elif tag == 'sheet' and elem.get('name') == sheet_name:
+            rel_id = elem.get(REL_ID)
+    if rel_id is None:
+        raise KeyError(f"Worksheet {sheet_name} does not exist.")
+    sheet_path = strings_path = None
+    for rel in fromstring(archive.read('xl/_rels/workbook.xml.rels')):
+        target = rel.get('Target', '')
+        target = target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join('xl', target))
+        if rel.get('Id') == rel_id:
+            sheet_path = target
+        elif rel.get('Type', '').endswith('/sharedStrings'):
+            strings_path = target
+    return sheet_path, strings_path, EXCEL_EPOCHS[date1904]
+
+
+def lookup(file_path, sheet_name, date, name):
+    """
+    Read one tracker cell without pandas or openpyxl, streaming the sheet's XML straight
+    out of the xlsx.
+
+    Only the header row and, per row, the Days and `name` cells are decoded, and the scan
+    stops at the row for `date` (a datetime.date) or at the first later day, as Days are in
+    date order. Memory stays flat whatever the size of the workbook. Returns
+    (has_column, found, value) like tracker_sidecar.lookup; empty cells are None.
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        sheet_path, strings_path, epoch = _locate(archive, sheet_name)
+        strings = _SharedStrings(archive, strings_path)
+        with archive.open(sheet_path) as stream:
+            reader = _RowReader()
+            rows = reader.iter_rows(stream)
+            header = next(rows, {})
+            shared = strings.get(v for v in header.values() if isinstance(v, _SharedIndex))
+            columns = {}
+            for col in sorted(header):
+                # As with pandas, the first of two same-named columns is the one looked up
+                columns.setdefault(shared.get(header[col], header[col]), col)
+            if name not in columns or DAYS_COLUMN not in columns:
+                return name in columns, False, None
+            days_col, col = columns[DAYS_COLUMN], columns[name]
+            reader.wanted = {days_col, col}
+            for row in rows:
+                day = _day(row.get(days_col), strings, epoch)
+                if day is None:
+                    continue
+                if day == date:
+                    value = row.get(col)
+                    if isinstance(value, _SharedIndex):
+                        value = strings.get([value]).get(value)
+                    return True, True, value
+                if day > date:
+                    break
+            return True, False, None
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+import metrics
+from task_matcher import LINE_RE, SUMMARY_VERBS, VERB_RE
+
+# === CONFIG ===
+DAYS_COLUMN = 'Days'
+TASK_COLUMNS = ['date', 'person', 'line', 'verb', 'type', 'base']
+# The breaks str.splitlines() splits on, so cells split the same way as task_matcher.split_lines
+LINE_BREAKS = r'\r\n|[\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]'
+
+
+def person_columns(columns):
+    """The person columns of a tracker sheet: everything but Days and headerless columns."""
+    return [name for name in columns if name != DAYS_COLUMN and not str(name).startswith('Unnamed:')]
+
+
+@metrics.timed('tracker_tasks.extract_tasks')
+def extract_tasks(frame):
+    """
+    Parse every cell of a tracker slice (Days plus one column per person) at once into a tidy
+    frame with one row per task line: date, person, line, verb, type, base.
+
+    Cells are split and lines parsed as split_lines and parse_line do, with pandas string
+    operations over all cells instead of a Python loop per cell. `verb` is the summary verb,
+    NaN when the line has none; `base` is NaN when the line does not parse; `type` is '',
+    'TC', 'TP' or 'TC/TP'.
+    """
+    people = person_columns(frame.columns)
+    cells = frame.melt(id_vars=DAYS_COLUMN, value_vars=people, var_name='person', value_name='cell')
+    cells = cells[cells['cell'].notna()]
+    tasks = cells.assign(line=cells['cell'].astype(str).str.split(LINE_BREAKS, regex=True)).explode('line')
+    tasks = tasks.assign(line=tasks['line'].str.strip('-').str.strip())
+    tasks = tasks[tasks['line'] != '']
+    lines = tasks['line']
+    lowered = lines.str.lower()
+    verb = lowered.str.extract(VERB_RE.pattern, expand=False).map(SUMMARY_VERBS)
+    parsed = lowered.str.extract(LINE_RE.pattern)
+    # LINE_RE also matches inside longer words ("authors"), where parse_line finds no verb
+    base = parsed[1].where(verb.notna())
+    indicator = parsed[0].where(base.notna()).fillna('')
+    has_tc = indicator.str.contains('tc', regex=False)
+    has_tp = indicator.str.contains('tp', regex=False)
+    typ = np.select([has_tc & has_tp, has_tc, has_tp], ['TC/TP', 'TC', 'TP'], default='')
+    return pd.DataFrame({'date': pd.to_datetime(tasks[DAYS_COLUMN]).dt.date, 'person': tasks['person'],
+                         'line': lines, 'verb': verb, 'type': typ, 'base': base},
+                        columns=TASK_COLUMNS).reset_index(drop=True)
+
+
+@metrics.timed('tracker_tasks.match_tasks')
+def match_tasks(tasks, index, substring_fallback=False):
+    """
+    Match a frame from extract_tasks against a SummaryIndex and return one (date, person, key)
+    row per matched issue. Each distinct (verb, type, base) is looked up once, however many
+    people and days it appears under. With `substring_fallback`, lines without any verb
+    match summaries containing the whole line, as in SummaryIndex.match_lines.
+    """
+    parsed = tasks[tasks['base'].notna()]
+    combos = parsed[['verb', 'type', 'base']].drop_duplicates()
+    combos['key'] = [sorted(index.match_parsed((verb, tuple(typ.split('/')) if typ else (), base)))
+                     for verb, typ, base in combos.itertuples(index=False)]
+    matched = [parsed.merge(combos, on=['verb', 'type', 'base'])]
+    if substring_fallback:
+        loose = tasks[tasks['verb'].isna()]
+        lines = {line: sorted(index.match_substring(line)) for line in loose['line'].unique()}
+        matched.append(loose.assign(key=loose['line'].map(lines)))
+    keys = pd.concat(matched).explode('key').dropna(subset=['key'])
+    return keys[['date', 'person', 'key']].drop_duplicates().reset_index(drop=True)
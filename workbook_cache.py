@@ -0,0 +1,107 @@
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+import tracker_sidecar
+
+# === CONFIG ===
+WORKBOOK_CACHE_MAX_BYTES = int(os.getenv('WORKBOOK_CACHE_MAX_BYTES', str(256 * 1024 * 1024)))
+DAYS_COLUMN = 'Days'
+
+
+class Workbook:
+    """A parsed tracker sheet with date -> row and name -> column indexes for O(1) lookups."""
+
+    def __init__(self, df):
+        df[DAYS_COLUMN] = pd.to_datetime(df[DAYS_COLUMN], errors='coerce')
+        self.df = df
+        self.date_index = {}
+        for row, day in enumerate(df[DAYS_COLUMN]):
+            if pd.notna(day):
+                # Keep the first row of a repeated date, as the boolean-mask lookup did
+                self.date_index.setdefault(day.date(), row)
+        self.column_index = {name: col for col, name in enumerate(df.columns)}
+        self.nbytes = int(df.memory_usage(index=True, deep=True).sum())
+
+    def has_column(self, name):
+        return name in self.column_index
+
+    def row_for(self, date):
+        """Return the row position for a datetime.date, or None."""
+        return self.date_index.get(date)
+
+    def cell(self, row, name):
+        return self.df.iat[row, self.column_index[name]]
+
+    def iter_range(self, name, start, end):
+        """Yield (date, value) for one column over start..end (datetime.date, inclusive), in date order."""
+        col = self.column_index[name]
+        for day in sorted(d for d in self.date_index if start <= d <= end):
+            yield day, self.df.iat[self.date_index[day], col]
+
+    def frame(self, start, end, names=None):
+        """Days plus the given columns (all by default) over start..end (datetime.date, inclusive), one row per date in date order."""
+        rows = [self.date_index[day] for day in sorted(d for d in self.date_index if start <= d <= end)]
+        names = [name for name in (names if names is not None else self.df.columns) if name != DAYS_COLUMN]
+        return self.df.iloc[rows][[DAYS_COLUMN] + names]
+
+
+class WorkbookCache:
+    """
+    LRU cache of parsed workbooks keyed by (path, sheet, mtime, size).
+
+    A file that changes on disk gets a new key and is re-parsed on its next lookup; the
+    total parsed size is kept under `max_bytes` by evicting the least recently used sheet.
+    """
+
+    def __init__(self, max_bytes=WORKBOOK_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _key(self, file_path, sheet_name):
+        stat = os.stat(file_path)
+        return (os.path.abspath(file_path), sheet_name, stat.st_mtime_ns, stat.st_size)
+
+    def peek(self, file_path, sheet_name):
+        """Return the cached Workbook for the file's current version, or None without loading anything."""
+        key = self._key(file_path, sheet_name)
+        with self._lock:
+            workbook = self._entries.get(key)
+            if workbook is not None:
+                self._entries.move_to_end(key)
+            return workbook
+
+    def get(self, file_path, sheet_name):
+        """Return the Workbook for a sheet, loading it only if it is not cached for the file's current version."""
+        key = self._key(file_path, sheet_name)
+        with self._lock:
+            workbook = self._entries.get(key)
+            if workbook is not None:
+                self._entries.move_to_end(key)
+                return workbook
+        try:
+            df = tracker_sidecar.load_frame(file_path, sheet_name)
+        except OSError:
+            # Sidecar directory not writable; parse the workbook directly
+            df = pd.read_excel(file_path, sheet_name=sheet_name)
+        workbook = Workbook(df)
+        with self._lock:
+            # Older versions of the same sheet will never be asked for again
+            for stale in [k for k in self._entries if k[:2] == key[:2]]:
+                del self._entries[stale]
+            self._entries[key] = workbook
+            total = sum(w.nbytes for w in self._entries.values())
+            while total > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                total -= evicted.nbytes
+        return workbook
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+workbook_cache = WorkbookCache()
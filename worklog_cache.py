@@ -0,0 +1,165 @@
+import datetime
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from task_cache import pat_fingerprint
+
+# === CONFIG ===
+WORKLOG_CACHE_TTL = float(os.getenv('WORKLOG_CACHE_TTL', '120'))  # seconds a user's worklogs are served without asking JIRA
+WORKLOG_CACHE_MAX_USERS = int(os.getenv('WORKLOG_CACHE_MAX_USERS', '64'))  # LRU bound across PATs
+WORKLOG_CACHE_MARGIN = float(os.getenv('WORKLOG_CACHE_MARGIN', str(24 * 3600)))  # fetched before the earliest start
+
+STARTED_FORMAT = '%Y-%m-%dT%H:%M:%S.%f%z'
+USER_FIELDS = ('accountId', 'key', 'name')
+
+
+def parse_started(started):
+    """Parse a JIRA `started` timestamp into an aware datetime, or None."""
+    try:
+        return datetime.datetime.strptime(started, STARTED_FORMAT)
+    except (TypeError, ValueError):
+        return None
+
+
+def _epoch_ms(moment):
+    return int(moment.timestamp() * 1000)
+
+
+def _minute(moment):
+    """Key a start time to the minute in UTC, the precision the log forms work at."""
+    return moment.astimezone(datetime.timezone.utc).replace(second=0, microsecond=0, tzinfo=None)
+
+
+class Worklogs:
+    """
+    Snapshot of one user's own worklogs, indexed for the pre-logging checks.
+
+    Days are bucketed by the UTC date of the start, which is how this app labels the
+    start times it sends.
+    """
+
+    def __init__(self, records):
+        self.starts = set()
+        self.day_seconds = {}
+        for issue_id, started, seconds in records:
+            minute = _minute(started)
+            self.starts.add((issue_id, minute))
+            self.day_seconds[minute.date()] = self.day_seconds.get(minute.date(), 0) + seconds
+
+    def is_logged(self, issue_id, started):
+        """True when a worklog on `issue_id` already starts at the same minute as `started`."""
+        moment = parse_started(started)
+        return moment is not None and (str(issue_id), _minute(moment)) in self.starts
+
+    def day_total(self, day):
+        """Seconds already logged on `day` (a date)."""
+        return self.day_seconds.get(day, 0)
+
+
+class _Entry:
+    """Cached worklogs of a single user."""
+
+    def __init__(self):
+        self.user = None  # identifiers of the PAT owner, matched against worklog authors
+        self.records = {}  # worklog id -> (issue_id, started, seconds)
+        self.covered_since = None  # epoch ms the records are complete from
+        self.until = None  # epoch ms to resume the incremental fetch from
+        self.synced_at = 0.0
+        self.stale = True
+        self.snapshot = None
+
+
+class WorklogCache:
+    """
+    Per-PAT cache of the user's own worklogs, used to catch duplicates and show day totals
+    before anything is written.
+
+    The first read fetches every worklog changed since shortly before the earliest start
+    asked about, through JIRA's updated/deleted worklog feeds and /worklog/list, and keeps
+    the ones the user authored. Later reads only fetch what changed since the feed's last
+    `until`, once the entry is older than `ttl` or was invalidated after logging work.
+    JIRA leaves the most recent minute out of those feeds, so writes made by this app are
+    still guarded by the job ledger until they show up here.
+    """
+
+    def __init__(self, ttl=WORKLOG_CACHE_TTL, max_users=WORKLOG_CACHE_MAX_USERS, margin=WORKLOG_CACHE_MARGIN):
+        self.ttl = ttl
+        self.max_users = max_users
+        self.margin = margin
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, pat, since, get_myself, get_changes):
+        """
+        Return (Worklogs, error) covering worklogs that start at or after the aware datetime `since`.
+        `get_myself()` must return (user, error) and `get_changes(since_ms)` must return
+        ((worklogs, deleted_ids, until), error); both are only called when the entry is cold or expired.
+        """
+        user = pat_fingerprint(pat)
+        since_ms = _epoch_ms(since) - int(self.margin * 1000)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(user)
+            if entry is None:
+                entry = _Entry()
+                self._entries[user] = entry
+                while len(self._entries) > self.max_users:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(user)
+            full = entry.covered_since is None or since_ms < entry.covered_since
+            if not full and not entry.stale and now - entry.synced_at < self.ttl:
+                return entry.snapshot, None
+            owner = entry.user
+            fetch_from = since_ms if full else entry.until
+
+        if owner is None:
+            myself, error = get_myself()
+            if error:
+                return self._fallback(entry, error)
+            owner = {myself[field] for field in USER_FIELDS if myself.get(field)}
+        changes, error = get_changes(fetch_from)
+        if error:
+            return self._fallback(entry, error)
+        worklogs, deleted, until = changes
+
+        with self._lock:
+            entry.user = owner
+            records = {} if full else entry.records
+            for worklog_id in deleted:
+                records.pop(str(worklog_id), None)
+            for worklog in worklogs:
+                author = worklog.get('author') or {}
+                started = parse_started(worklog.get('started'))
+                if started is None or not any(author.get(field) in owner for field in USER_FIELDS):
+                    continue
+                records[str(worklog['id'])] = (str(worklog.get('issueId')), started, worklog.get('timeSpentSeconds', 0))
+            entry.records = records
+            if full:
+                entry.covered_since = since_ms
+            entry.until = until
+            entry.synced_at = now
+            entry.stale = False
+            entry.snapshot = Worklogs(records.values())
+            return entry.snapshot, None
+
+    def _fallback(self, entry, error):
+        with self._lock:
+            if entry.snapshot is not None:
+                # Checks against the last known worklogs beat no checks at all
+                return entry.snapshot, None
+        return None, error
+
+    def invalidate(self, pat):
+        """Mark a user's entry stale so the next read fetches what changed."""
+        with self._lock:
+            entry = self._entries.get(pat_fingerprint(pat))
+            if entry is not None:
+                entry.stale = True
+
+    def clear(self):
+        """Drop every cached entry."""
+        with self._lock:
+            self._entries.clear()
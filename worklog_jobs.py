@@ -0,0 +1,194 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from task_cache import pat_fingerprint
+
+# === CONFIG ===
+WORKLOG_JOB_WORKERS = int(os.getenv('WORKLOG_JOB_WORKERS', '8'))  # worklogs posted at once across all jobs
+WORKLOG_JOBS_DB = os.getenv('WORKLOG_JOBS_DB')  # optional SQLite file; in-memory only when unset
+WORKLOG_JOBS_KEEP = float(os.getenv('WORKLOG_JOBS_KEEP', str(7 * 24 * 3600)))  # seconds finished jobs are kept
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, user TEXT, created REAL);
+CREATE TABLE IF NOT EXISTS items (
+    job_id TEXT, idx INTEGER, issue_key TEXT, time_spent TEXT, started TEXT,
+    ikey TEXT, status TEXT, message TEXT, PRIMARY KEY (job_id, idx)
+);
+CREATE TABLE IF NOT EXISTS ledger (ikey TEXT PRIMARY KEY, logged_at REAL);
+'''
+
+
+def idempotency_key(user, issue_key, time_spent, started):
+    """Identify one worklog write; the same user logging the same time at the same start is one write."""
+    raw = '\x1f'.join((user, str(issue_key), str(time_spent), str(started)))
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class WorklogJobs:
+    """
+    Background worklog submission.
+
+    `enqueue` records a batch and returns at once; items are posted on a shared worker
+    pool and their status (queued, running, done, failed, skipped, unknown) can be polled. Every
+    item has an idempotency key kept in a ledger once JIRA confirms the write, so
+    re-enqueueing the same batch, or overlapping batches, never log the same entry twice:
+    the same batch maps to the same job id and only its failed items run again. Items
+    whose post may or may not have reached JIRA (a timeout after sending) are `unknown`
+    and never retried automatically. Ledger entries expire with the jobs, so time deleted
+    in JIRA can be logged again later.
+
+    With `db_path` jobs and the ledger are also written to SQLite. PATs are never
+    persisted, so after a restart unfinished items are reported as interrupted.
+    """
+
+    def __init__(self, post_worklog, max_workers=WORKLOG_JOB_WORKERS, db_path=WORKLOG_JOBS_DB, on_success=None):
+        self.post_worklog = post_worklog
+        self.on_success = on_success
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='worklog-job')
+        self.jobs = {}
+        self.ledger = {}  # idempotency key -> when JIRA confirmed the write
+        self.inflight = set()
+        self._lock = threading.RLock()
+        self.db = None
+        if db_path:
+            self.db = sqlite3.connect(db_path, check_same_thread=False)
+            self.db.executescript(SCHEMA)
+            self._load()
+
+    def _load(self):
+        """Restore jobs and the ledger from SQLite after a restart."""
+        db = self.db
+        self.ledger = dict(db.execute('SELECT ikey, logged_at FROM ledger'))
+        for job_id, user, created in db.execute('SELECT id, user, created FROM jobs'):
+            self.jobs[job_id] = {'id': job_id, 'user': user, 'created': created, 'items': []}
+        rows = db.execute('SELECT job_id, issue_key, time_spent, started, ikey, status, message FROM items ORDER BY job_id, idx')
+        for job_id, issue_key, time_spent, started, ikey, status, message in rows:
+            if status == 'queued':
+                status, message = 'failed', 'Interrupted by a restart before posting; submit again to retry.'
+            elif status == 'running':
+                # The post may have reached JIRA, so never retry it automatically
+                status, message = 'unknown', 'Interrupted by a restart while posting; check JIRA before logging it again.'
+            item = {'issue_key': issue_key, 'time_spent': time_spent, 'started': started,
+                    'ikey': ikey, 'status': status, 'message': message}
+            if job_id in self.jobs:
+                self.jobs[job_id]['items'].append(item)
+        self._save_items([(job_id, i) for job_id, job in self.jobs.items() for i in range(len(job['items']))])
+
+    def _save_items(self, positions):
+        if self.db is None or not positions:
+            return
+        with self._lock:
+            self.db.executemany(
+                'INSERT OR REPLACE INTO items VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                [(job_id, idx, *(self.jobs[job_id]['items'][idx][k] for k in
+                                 ('issue_key', 'time_spent', 'started', 'ikey', 'status', 'message')))
+                 for job_id, idx in positions])
+            self.db.commit()
+
+    def enqueue(self, pat, entries, skipped=()):
+        """
+        Queue (issue_key, time_spent, started) entries for the PAT's owner and return the job id.
+        Entries whose index is in `skipped` (already in JIRA) are recorded as skipped and never posted.
+        """
+        user = pat_fingerprint(pat)
+        ikeys = [idempotency_key(user, *entry) for entry in entries]
+        job_id = hashlib.sha256('\x1f'.join([user] + ikeys).encode('utf-8')).hexdigest()[:16]
+        skipped = set(skipped)
+        with self._lock:
+            self._expire()
+            job = self.jobs.get(job_id)
+            if job is None:
+                job = {'id': job_id, 'user': user, 'created': time.time(),
+                       'items': [{'issue_key': key, 'time_spent': time_spent, 'started': started,
+                                  'ikey': ikey, 'status': 'queued', 'message': ''}
+                                 for (key, time_spent, started), ikey in zip(entries, ikeys)]}
+                for i in skipped:
+                    item = job['items'][i]
+                    item.update(status='skipped', message=f"{item['issue_key']} already has a worklog at this time in JIRA; skipped.")
+                self.jobs[job_id] = job
+                if self.db is not None:
+                    self.db.execute('INSERT OR REPLACE INTO jobs VALUES (?, ?, ?)', (job_id, user, job['created']))
+                self._save_items([(job_id, i) for i in skipped])
+                to_run = [i for i in range(len(job['items'])) if i not in skipped]
+            else:
+                # Same batch submitted again: what JIRA now has is skipped, only the rest of what failed is retried
+                skipped = {i for i in skipped if job['items'][i]['status'] in ('failed', 'unknown')}
+                for i in skipped:
+                    item = job['items'][i]
+                    item.update(status='skipped', message=f"{item['issue_key']} already has a worklog at this time in JIRA; skipped.")
+                self._save_items([(job_id, i) for i in skipped])
+                to_run = [i for i, item in enumerate(job['items']) if item['status'] == 'failed']
+                for i in to_run:
+                    job['items'][i].update(status='queued', message='')
+            self._save_items([(job_id, i) for i in to_run])
+        for i in to_run:
+            self.pool.submit(self._run_item, pat, job_id, i)
+        return job_id
+
+    def _run_item(self, pat, job_id, idx):
+        with self._lock:
+            item = self.jobs[job_id]['items'][idx]
+            if item['ikey'] in self.ledger:
+                item.update(status='skipped', message=f"Already logged {item['time_spent']} on {item['issue_key']}; skipped.")
+                self._save_items([(job_id, idx)])
+                return
+            if item['ikey'] in self.inflight:
+                item.update(status='skipped', message=f"{item['issue_key']} is already being logged by another job; skipped.")
+                self._save_items([(job_id, idx)])
+                return
+            self.inflight.add(item['ikey'])
+            item['status'] = 'running'
+        try:
+            result = self.post_worklog(pat, item['issue_key'], item['time_spent'], item['started'])
+        except Exception as exc:
+            # The request may already have gone out, so this is not a plain failure
+            result = {'ok': False, 'uncertain': True, 'message': f"Failed to log work: {exc}"}
+        with self._lock:
+            self.inflight.discard(item['ikey'])
+            if result['ok']:
+                status, message = 'done', result['message']
+            elif result.get('uncertain'):
+                status, message = 'unknown', f"{result['message']} The worklog may have been written; check JIRA before logging it again."
+            else:
+                status, message = 'failed', result['message']
+            item.update(status=status, message=message)
+            if result['ok']:
+                logged_at = time.time()
+                self.ledger[item['ikey']] = logged_at
+                if self.db is not None:
+                    self.db.execute('INSERT OR IGNORE INTO ledger VALUES (?, ?)', (item['ikey'], logged_at))
+            self._save_items([(job_id, idx)])
+        if result['ok'] and self.on_success:
+            self.on_success(pat)
+
+    def _expire(self):
+        cutoff = time.time() - WORKLOG_JOBS_KEEP
+        for job_id in [j for j, job in self.jobs.items() if job['created'] < cutoff]:
+            del self.jobs[job_id]
+            if self.db is not None:
+                self.db.execute('DELETE FROM jobs WHERE id = ?', (job_id,))
+                self.db.execute('DELETE FROM items WHERE job_id = ?', (job_id,))
+        for ikey in [k for k, logged_at in self.ledger.items() if logged_at < cutoff]:
+            del self.ledger[ikey]
+        if self.db is not None:
+            self.db.execute('DELETE FROM ledger WHERE logged_at < ?', (cutoff,))
+            self.db.commit()
+
+    def progress(self, job_id, pat):
+        """Return a JSON-ready progress dict for the PAT owner's job, or None if it is unknown."""
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None or job['user'] != pat_fingerprint(pat):
+                return None
+            items = [{k: item[k] for k in ('issue_key', 'time_spent', 'started', 'status', 'message')}
+                     for item in job['items']]
+        counts = {}
+        for item in items:
+            counts[item['status']] = counts.get(item['status'], 0) + 1
+        finished = counts.get('queued', 0) + counts.get('running', 0) == 0
+        return {'id': job_id, 'created': job['created'], 'total': len(items), 'counts': counts,
+                'finished': finished, 'items': items}